@@ -0,0 +1,105 @@
+"""
+Compares throughput of concurrent list & retrieve requests served by
+sync Owner*APIView classes, run the way Django's ASGI handler runs sync
+views (`sync_to_async`), and by their Async* counterparts.
+
+Django's async ORM still runs queries in a thread, so the difference
+mostly comes from views not occupying that thread between queries.
+
+Usage: python benchmarks/async_views.py [concurrency] [rounds] [objects]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+from django.conf import settings  # noqa: E402
+
+# In memory SQLite databases are not shared between threads
+settings.DATABASES["default"]["NAME"] = os.path.join(
+    tempfile.mkdtemp(), "benchmark.sqlite3"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework.test import force_authenticate  # noqa: E402
+
+from drfaddons.generics import AsyncOwnerListAPIView  # noqa: E402
+from drfaddons.generics import AsyncOwnerRetrieveAPIView  # noqa: E402
+from drfaddons.generics import OwnerListAPIView  # noqa: E402
+from drfaddons.generics import OwnerRetrieveAPIView  # noqa: E402
+from tests.models import Note  # noqa: E402
+
+
+class NoteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Note
+        fields = ("id", "title", "priority", "create_date")
+
+
+def make_view(base):
+    return type(
+        base.__name__,
+        (base,),
+        {"queryset": Note.objects.all(), "serializer_class": NoteSerializer},
+    ).as_view()
+
+
+async def run(view, user, concurrency, rounds, **kwargs):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        requests = []
+        for _ in range(concurrency):
+            request = APIRequestFactory().get("/")
+            force_authenticate(request, user=user)
+            requests.append(request)
+        await asyncio.gather(*(view(request, **kwargs) for request in requests))
+    return concurrency * rounds / (time.perf_counter() - start)
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    objects = int(sys.argv[3]) if len(sys.argv) > 3 else 25
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    user = get_user_model().objects.create(username="user")
+    notes = [
+        Note.objects.create(title="Note {}".format(i), created_by=user)
+        for i in range(objects)
+    ]
+
+    cases = (
+        ("list", OwnerListAPIView, AsyncOwnerListAPIView, {}),
+        (
+            "retrieve",
+            OwnerRetrieveAPIView,
+            AsyncOwnerRetrieveAPIView,
+            {"pk": notes[0].pk},
+        ),
+    )
+    for name, sync_base, async_base, kwargs in cases:
+        results = {}
+        for label, view in (
+            ("sync", sync_to_async(make_view(sync_base))),
+            ("async", make_view(async_base)),
+        ):
+            results[label] = asyncio.run(run(view, user, concurrency, rounds, **kwargs))
+            print("{:<9} {:<6} {:8.0f} requests/s".format(name, label, results[label]))
+        print("{:<9} {:6.2f}x sync".format(name, results["async"] / results["sync"]))
+
+
+if __name__ == "__main__":
+    main()
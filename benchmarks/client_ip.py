@@ -0,0 +1,82 @@
+"""
+Compares X-Forwarded-For resolution throughput of resolve_client_ip,
+with TrustedNetworks' per prefix length lookup, against matching every
+trusted network in turn, and against the legacy get_client_ip.
+
+Usage: python benchmarks/client_ip.py [networks] [number] [repeat]
+"""
+
+import ipaddress
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+
+from drfaddons.utils import get_client_ip  # noqa: E402
+from drfaddons.utils import parse_ip  # noqa: E402
+from drfaddons.utils import resolve_client_ip  # noqa: E402
+from drfaddons.utils import TrustedNetworks  # noqa: E402
+
+
+class LinearNetworks:
+    """Checks an address against every network"""
+
+    def __init__(self, networks):
+        self.networks = [ipaddress.ip_network(network) for network in networks]
+
+    def __contains__(self, address):
+        return any(address in network for network in self.networks)
+
+    def __bool__(self):
+        return bool(self.networks)
+
+
+def make_networks(count):
+    random.seed(0)
+    networks = {"10.0.0.0/8"}
+    while len(networks) < count:
+        prefixlen = random.randint(16, 30)
+        address = ipaddress.ip_address(random.getrandbits(32))
+        networks.add(str(ipaddress.ip_network((address, prefixlen), strict=False)))
+    return sorted(networks)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    number = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    networks = make_networks(count)
+
+    request = RequestFactory().get(
+        "/",
+        REMOTE_ADDR="10.0.0.1",
+        HTTP_X_FORWARDED_FOR="203.0.113.7, 198.51.100.23, 10.0.0.2, 10.0.0.3",
+    )
+
+    linear = LinearNetworks(networks)
+    prefix = TrustedNetworks(networks)
+    cases = (
+        ("legacy", lambda: get_client_ip(request)),
+        ("linear", lambda: resolve_client_ip(request, trusted_proxies=linear)),
+        ("prefix", lambda: resolve_client_ip(request, trusted_proxies=prefix)),
+    )
+    assert str(resolve_client_ip(request, trusted_proxies=prefix)) == "198.51.100.23"
+    parse_ip.cache_clear()
+
+    print("{} trusted networks".format(len(networks)))
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=number, repeat=repeat))
+        print("{:<7} {:8.3f} us/request".format(name, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares throughput of JSON backends available to utils.JsonResponse
+on a payload shaped like a PaginatedSearchView response.
+
+Usage: python benchmarks/json_backends.py [objects] [repeat]
+"""
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils.translation import gettext_lazy as _  # noqa: E402
+
+from drfaddons.utils import JSON_BACKENDS  # noqa: E402
+
+
+def payload(objects):
+    start = datetime(2020, 1, 1, 10, 30)
+    return {
+        "data": {
+            "total_pages": 1,
+            "current": 1,
+            "total_objects": objects,
+            "next": -1,
+            "previous": -1,
+            "objects": [
+                {
+                    "id": i,
+                    "uuid": uuid.uuid4(),
+                    "title": "Object {}".format(i),
+                    "status": _("Active"),
+                    "amount": Decimal("1999.99"),
+                    "create_date": start + timedelta(minutes=i),
+                    "update_date": start + timedelta(minutes=i, seconds=30),
+                    "tags": ["alpha", "beta", "gamma"],
+                    "is_active": i % 2 == 0,
+                }
+                for i in range(objects)
+            ],
+        },
+        "status_code": 202,
+    }
+
+
+def main():
+    objects = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    data = payload(objects)
+
+    results = {}
+    for name, (module, dumps) in JSON_BACKENDS.items():
+        if module is None:
+            print("{:<8} not installed".format(name))
+            continue
+        best = min(timeit.repeat(lambda: dumps(data), number=1, repeat=repeat))
+        results[name] = best
+        print("{:<8} {:8.2f} ms/payload".format(name, best * 1000))
+
+    if "json" in results:
+        for name, best in results.items():
+            print("{:<8} {:6.2f}x json".format(name, results["json"] / best))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares latency of owner scoped, date ordered listings on a synthetic
+table with and without `models.owner_indexes()`.
+
+Usage: python benchmarks/owner_indexes.py [rows] [users] [repeat]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import models  # noqa: E402
+
+from drfaddons.models import CreateUpdateModel  # noqa: E402
+from drfaddons.models import owner_indexes  # noqa: E402
+
+
+class PlainRow(CreateUpdateModel):
+    title = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = "tests"
+
+
+class IndexedRow(CreateUpdateModel):
+    title = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = "tests"
+        indexes = owner_indexes()
+
+
+def populate(model, users, rows):
+    random.seed(0)
+    model.objects.bulk_create(
+        [
+            model(title="Row {}".format(i), created_by=random.choice(users))
+            for i in range(rows)
+        ],
+        batch_size=5000,
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    # Creates tables of models above too, as they have no migrations.
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+    owners = get_user_model().objects.bulk_create(
+        [get_user_model()(username="user{}".format(i)) for i in range(users)]
+    )
+    owner = owners[0]
+
+    for model in (PlainRow, IndexedRow):
+        populate(model, owners, rows)
+        for ordering in ("-create_date", "-update_date"):
+            queryset = model.objects.filter(created_by=owner).order_by(ordering)[:25]
+            best = min(
+                timeit.repeat(lambda: list(queryset.all()), number=1, repeat=repeat)
+            )
+            print(
+                "{:<10} {:<13} {:8.3f} ms/page".format(
+                    model.__name__, ordering, best * 1000
+                )
+            )
+            print("    " + queryset.explain().replace("\n", "\n    "))
+
+
+if __name__ == "__main__":
+    main()
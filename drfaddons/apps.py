@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class DrfAddonsConfig(AppConfig):
+    name = "drfaddons"
+    verbose_name = "Add Ons | Django REST Framework"
+
+    def ready(self):
+        # Connects cache invalidation signals
+        from . import cache  # noqa: F401
@@ -1,5 +1,105 @@
+import copy
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+from typing import Optional
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import setting_changed
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework import exceptions
 from rest_framework.authentication import SessionAuthentication
 from rest_framework_jwt.authentication import BaseJSONWebTokenAuthentication
+from rest_framework_jwt.authentication import jwt_decode_handler
+from rest_framework_jwt.authentication import jwt_get_username_from_payload
+from rest_framework_jwt.settings import api_settings
+
+from .cache import get_jwt_cache
+
+# Matches first, second and start of third word of a header, the way
+# bytes.split() would have split it, without building a list
+AUTH_HEADER_RE = re.compile(rb"\s*(\S*)\s*(\S*)\s*(\S?)")
+
+SPACES_ERROR = gettext_lazy(
+    "Invalid Authorization header. Credentials string should not contain spaces."
+)
+
+
+@lru_cache(maxsize=None)
+def encode_prefix(prefix):
+    """Returns prefix lowercased & encoded, as compared with headers"""
+    return (prefix or "").lower().encode(HTTP_HEADER_ENCODING)
+
+
+class JWTAuthConfig(NamedTuple):
+    """Header & cookie configuration of JSONWebTokenAuthenticationQS"""
+
+    key: str
+    header_key: str
+    prefix: str
+    auth_prefix: bytes
+    cookie: Optional[str]
+
+    @classmethod
+    def from_settings(cls):
+        """
+        Builds config from `JWT_AUTH_KEY` and `JWT_AUTH_HEADER_PREFIX` &
+        `JWT_AUTH_COOKIE` of `JWT_AUTH` settings. Unlike
+        `rest_framework_jwt.settings.api_settings`, it follows changes
+        made by `override_settings`.
+        """
+        jwt_auth = getattr(settings, "JWT_AUTH", None) or {}
+        key = getattr(settings, "JWT_AUTH_KEY", "Authorization")
+        prefix = jwt_auth.get(
+            "JWT_AUTH_HEADER_PREFIX", api_settings.JWT_AUTH_HEADER_PREFIX
+        )
+
+        return cls(
+            key=key,
+            header_key="HTTP_" + key.upper().replace("-", "_"),
+            prefix=prefix,
+            auth_prefix=encode_prefix(prefix),
+            cookie=jwt_auth.get("JWT_AUTH_COOKIE", api_settings.JWT_AUTH_COOKIE),
+        )
+
+
+_jwt_auth_config = None
+_jwt_auth_config_lock = threading.Lock()
+
+
+def get_jwt_auth_config():
+    """
+    Returns JWTAuthConfig, built once and rebuilt after `JWT_AUTH_KEY`
+    or `JWT_AUTH` settings change.
+    """
+    global _jwt_auth_config
+
+    config = _jwt_auth_config
+    if config is None:
+        with _jwt_auth_config_lock:
+            if _jwt_auth_config is None:
+                _jwt_auth_config = JWTAuthConfig.from_settings()
+            config = _jwt_auth_config
+    return config
+
+
+def reset_jwt_auth_config(setting, **kwargs):
+    global _jwt_auth_config
+
+    if setting in ("JWT_AUTH_KEY", "JWT_AUTH"):
+        with _jwt_auth_config_lock:
+            _jwt_auth_config = None
+
+
+setting_changed.connect(
+    reset_jwt_auth_config, dispatch_uid="drfaddons_reset_jwt_auth_config"
+)
 
 
 class JSONWebTokenAuthenticationQS(BaseJSONWebTokenAuthentication):
@@ -12,18 +112,28 @@ class JSONWebTokenAuthenticationQS(BaseJSONWebTokenAuthentication):
     This model will first look into HEADER and if the key is not found
     there, it looks for key in the body.
     Key is also changeable and can be set in Django settings as
-    JWT_AUTH_KEY with default value of Authorization.
+    JWT_AUTH_KEY with default value of Authorization. Settings are
+    read through `get_jwt_auth_config()`.
+
+    If `DRFADDONS_JWT_CACHE` is set, verified tokens are cached (see
+    `drfaddons.cache.JWTCache`) and repeated requests with the same
+    token skip signature verification and user lookup.
 
     Source: Himanshu Shankar (https://github.com/iamhssingh)
     """
 
-    from rest_framework_jwt.settings import api_settings
-    from django.conf import settings
+    # Read from JWTAuthConfig, can still be overridden by subclasses
+    key = property(lambda self: get_jwt_auth_config().key)
+    header_key = property(lambda self: get_jwt_auth_config().header_key)
+    prefix = property(lambda self: get_jwt_auth_config().prefix)
+    cookie = property(lambda self: get_jwt_auth_config().cookie)
 
-    key = getattr(settings, "JWT_AUTH_KEY", "Authorization")
-    header_key = "HTTP_" + key.upper()
-    prefix = api_settings.JWT_AUTH_HEADER_PREFIX
-    cookie = api_settings.JWT_AUTH_COOKIE
+    @property
+    def auth_prefix(self):
+        """Lowercased & encoded prefix, which follows prefix overrides"""
+        if type(self).prefix is JSONWebTokenAuthenticationQS.prefix:
+            return get_jwt_auth_config().auth_prefix
+        return encode_prefix(self.prefix)
 
     def get_authorization(self, request):
         """
@@ -44,12 +154,9 @@ class JSONWebTokenAuthenticationQS(BaseJSONWebTokenAuthentication):
 
             Hide some test client ickyness where the header can be unicode.
         """
-        from six import text_type
-        from rest_framework import HTTP_HEADER_ENCODING
-
         auth = request.META.get(self.header_key, b"")
 
-        if isinstance(auth, text_type):
+        if isinstance(auth, str):
             # Work around django test client oddness
             auth = auth.encode(HTTP_HEADER_ENCODING)
         return auth
@@ -68,37 +175,150 @@ class JSONWebTokenAuthenticationQS(BaseJSONWebTokenAuthentication):
             This returns the extracted JWT auth token string.
 
         """
-        from django.utils.encoding import smart_text
-        from django.utils.translation import ugettext as _
-        from rest_framework import exceptions
+        first, second, more = AUTH_HEADER_RE.match(
+            self.get_authorization(request)
+        ).groups()
 
-        auth = self.get_authorization(request).split()
-        auth_header_prefix = self.prefix.lower() or ""
-
-        if not auth:
+        if not first:
             if self.cookie:
                 return request.COOKIES.get(self.cookie)
             return None
 
-        if auth_header_prefix is None or len(auth_header_prefix) < 1:
-            auth.append("")
-            auth.reverse()
+        if not self.auth_prefix:
+            # Without prefix, header contains the token only
+            if second:
+                raise exceptions.AuthenticationFailed(SPACES_ERROR)
+            return first
 
-        if smart_text(auth[0].lower()) != auth_header_prefix:
+        if first.lower() != self.auth_prefix:
             return None
 
-        if len(auth) == 1:
+        if not second:
             msg = _("Invalid Authorization header. No credentials provided.")
             raise exceptions.AuthenticationFailed(msg)
 
-        elif len(auth) > 2:
-            msg = _(
-                "Invalid Authorization header. Credentials string "
-                "should not contain spaces."
+        if more:
+            raise exceptions.AuthenticationFailed(SPACES_ERROR)
+
+        return second
+
+    def decode_jwt(self, jwt_value):
+        """
+        Verifies the signature of a JWT and returns its payload.
+
+        Raises
+        ------
+        AuthenticationFailed
+            If the token is expired or invalid.
+        """
+        try:
+            return jwt_decode_handler(jwt_value)
+        except jwt.ExpiredSignatureError:
+            raise exceptions.AuthenticationFailed(_("Signature has expired."))
+        except jwt.DecodeError:
+            raise exceptions.AuthenticationFailed(_("Error decoding signature."))
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed()
+
+    def authenticate(self, request):
+        jwt_value = self.get_jwt_value(request)
+        if jwt_value is None:
+            return None
+
+        jwt_cache = get_jwt_cache()
+        if jwt_cache is not None:
+            cached = jwt_cache.get(jwt_value)
+            if cached is not None:
+                # Copy, so that changes made to request.user don't leak
+                return copy.copy(cached[1]), jwt_value
+
+        payload = self.decode_jwt(jwt_value)
+        user = self.authenticate_credentials(payload)
+        if jwt_cache is not None:
+            jwt_cache.set(jwt_value, payload, user)
+        return user, jwt_value
+
+    def authenticate_tokens(self, tokens, max_workers=None):
+        """
+        Authenticates many raw tokens at once, e.g. of requests forwarded
+        by a gateway. Users of all the tokens are fetched by one query.
+
+        Parameters
+        ----------
+        tokens: list
+            Raw JWTs, as str or bytes.
+        max_workers: int, optional
+            If set, signatures are verified in a thread pool of these
+            many threads. Worth it with RSA/ECDSA keys, whose verification
+            releases the GIL. Note that a custom `JWT_GET_USER_SECRET_KEY`
+            then queries the database from these threads.
+
+        Returns
+        -------
+        results: List[dict]
+            One dict per token with `success`, `user`, `payload` and
+            `message`, the reason of failure. Failures are reported here
+            instead of raising AuthenticationFailed.
+        """
+        jwt_cache = get_jwt_cache()
+        results = [
+            {"success": False, "user": None, "payload": None, "message": None}
+            for _ in tokens
+        ]
+
+        pending = []
+        for index, token in enumerate(tokens):
+            cached = jwt_cache.get(token) if jwt_cache is not None else None
+            if cached is None:
+                pending.append(index)
+            else:
+                results[index].update(
+                    success=True, payload=cached[0], user=copy.copy(cached[1])
+                )
+
+        def decode(index):
+            try:
+                return self.decode_jwt(tokens[index])
+            except exceptions.AuthenticationFailed as ex:
+                results[index]["message"] = str(ex.detail)
+
+        if max_workers and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                payloads = list(executor.map(decode, pending))
+        else:
+            payloads = [decode(index) for index in pending]
+
+        # username -> indexes of tokens
+        usernames = {}
+        for index, payload in zip(pending, payloads):
+            if payload is None:
+                continue
+            results[index]["payload"] = payload
+            username = jwt_get_username_from_payload(payload)
+            if username:
+                usernames.setdefault(username, []).append(index)
+            else:
+                results[index]["message"] = _("Invalid payload.")
+
+        if usernames:
+            User = get_user_model()
+            users = User._default_manager.filter(
+                **{User.USERNAME_FIELD + "__in": list(usernames)}
             )
-            raise exceptions.AuthenticationFailed(msg)
+            for user in users:
+                for index in usernames.pop(user.get_username(), []):
+                    if not user.is_active:
+                        results[index]["message"] = _("User account is disabled.")
+                        continue
+                    results[index].update(success=True, user=user)
+                    if jwt_cache is not None:
+                        jwt_cache.set(tokens[index], results[index]["payload"], user)
+
+        for indexes in usernames.values():
+            for index in indexes:
+                results[index]["message"] = _("Invalid signature.")
 
-        return auth[1]
+        return results
 
 
 class CsrfExemptSessionAuthentication(SessionAuthentication):
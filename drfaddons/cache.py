@@ -0,0 +1,357 @@
+"""
+Owner scoped caching of GET responses of Owner*APIView classes.
+
+Every (model, owner) pair has a version, a random token replaced on
+every save or deletion of an object of the owner. Cached responses
+are keyed with it, so a `post_save`/`post_delete` of any object of an
+owner invalidates all cached responses of that owner at once.
+Eviction (TTL & LRU) is left to Django's cache framework.
+
+It also holds JWTCache, which lets JSONWebTokenAuthenticationQS skip
+signature verification and user lookup of repeatedly presented tokens.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+
+from .models import CreateUpdateModel
+
+
+def get_cache():
+    """Returns the cache set in `DRFADDONS_CACHE_ALIAS` (default: default)"""
+    return caches[getattr(settings, "DRFADDONS_CACHE_ALIAS", "default")]
+
+
+def owner_version_key(model, user_id):
+    return "drfaddons:owner:{}:{}".format(
+        model._meta.concrete_model._meta.label_lower, user_id
+    )
+
+
+def get_owner_version(model, user_id):
+    """
+    Returns current version of objects of model owned by user_id.
+
+    Parameters
+    ----------
+    model: CreateUpdateModel subclass
+    user_id: int
+
+    Returns
+    -------
+    version: str
+    """
+    return get_cache().get_or_set(
+        owner_version_key(model, user_id), uuid4().hex, None
+    )
+
+
+def invalidate_owner_cache(model, user_id):
+    """
+    Invalidates all cached responses of objects of model owned by
+    user_id. Has to be called after changes made without signals, e.g.
+    `QuerySet.update()` or `bulk_create()`.
+
+    Inside a transaction, version is bumped once it commits, so that
+    concurrent readers can't cache rows of the old snapshot under the
+    new version.
+    """
+    version = uuid4().hex
+    transaction.on_commit(
+        lambda: get_cache().set(owner_version_key(model, user_id), version, None)
+    )
+
+
+def invalidate_on_save(sender, instance, **kwargs):
+    # update_date isn't changed by save(update_fields=[...]), so it
+    # can't be the version
+    if instance.created_by_id:
+        invalidate_owner_cache(sender, instance.created_by_id)
+
+
+def invalidate_on_delete(sender, instance, **kwargs):
+    if instance.created_by_id:
+        invalidate_owner_cache(sender, instance.created_by_id)
+
+
+def connect_signals():
+    """
+    Connects invalidation receivers to every CreateUpdateModel
+    subclass only, so that other models can still be fast deleted
+    without signals.
+    """
+    for model in apps.get_models():
+        if issubclass(model, CreateUpdateModel):
+            post_save.connect(
+                invalidate_on_save, sender=model, dispatch_uid="drfaddons_cache_save"
+            )
+            post_delete.connect(
+                invalidate_on_delete,
+                sender=model,
+                dispatch_uid="drfaddons_cache_delete",
+            )
+
+
+if apps.models_ready:
+    connect_signals()
+
+
+class CacheStats:
+    """Thread safe hit/miss counters of a view's cache"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class JWTCache:
+    """
+    Bounded LRU cache of verified JSON Web Tokens, keyed by sha256 of
+    the token. Stores the decoded payload and the authenticated user
+    until the token expires or `timeout` seconds pass, whichever is
+    earlier. `timeout` bounds how long a deactivated user or a changed
+    signing key goes unnoticed.
+
+    Entries are kept in process and, if `alias` is set, also in that
+    Django cache so that they are shared between processes.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of entries kept in process
+    timeout: int
+        Maximum lifetime of an entry, in seconds
+    alias: str, optional
+        Alias of a Django cache to share entries through
+    """
+
+    key_prefix = "drfaddons:jwt:"
+
+    def __init__(self, maxsize=1024, timeout=300, alias=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.alias = alias
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(token):
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.sha256(token).hexdigest()
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, token):
+        """
+        Returns (payload, user) of a cached token, None otherwise.
+        """
+        key = self.make_key(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+
+        if entry is None and self.alias:
+            entry = caches[self.alias].get(self.key_prefix + key)
+            if entry is not None and entry[0] > now:
+                self._store(key, entry)
+            else:
+                entry = None
+
+        if entry is None:
+            self.stats.miss()
+            return None
+
+        self.stats.hit()
+        return entry[1], entry[2]
+
+    def set(self, token, payload, user):
+        """
+        Caches a verified token with its decoded payload and user.
+        """
+        now = time.time()
+        expires = now + self.timeout
+        if payload.get("exp"):
+            expires = min(expires, payload["exp"])
+        if expires <= now:
+            return
+
+        key = self.make_key(token)
+        entry = (expires, payload, user)
+        self._store(key, entry)
+        if self.alias:
+            caches[self.alias].set(self.key_prefix + key, entry, expires - now)
+
+    def delete(self, token):
+        key = self.make_key(token)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.alias:
+            caches[self.alias].delete(self.key_prefix + key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_jwt_cache = None
+_jwt_cache_lock = threading.Lock()
+
+
+def get_jwt_cache():
+    """
+    Returns the process wide JWTCache if `DRFADDONS_JWT_CACHE` is set,
+    None otherwise. It is configured with `DRFADDONS_JWT_CACHE_SIZE`
+    (default: 1024), `DRFADDONS_JWT_CACHE_TIMEOUT` (default: 300) and
+    `DRFADDONS_JWT_CACHE_ALIAS` (default: None, in process only)
+    settings.
+    """
+    global _jwt_cache
+
+    if not getattr(settings, "DRFADDONS_JWT_CACHE", False):
+        return None
+
+    with _jwt_cache_lock:
+        if _jwt_cache is None:
+            _jwt_cache = JWTCache(
+                maxsize=getattr(settings, "DRFADDONS_JWT_CACHE_SIZE", 1024),
+                timeout=getattr(settings, "DRFADDONS_JWT_CACHE_TIMEOUT", 300),
+                alias=getattr(settings, "DRFADDONS_JWT_CACHE_ALIAS", None),
+            )
+        return _jwt_cache
+
+
+def reset_jwt_cache(setting, **kwargs):
+    global _jwt_cache
+
+    if setting.startswith("DRFADDONS_JWT_CACHE"):
+        with _jwt_cache_lock:
+            _jwt_cache = None
+
+
+setting_changed.connect(reset_jwt_cache, dispatch_uid="drfaddons_reset_jwt_cache")
+
+
+class OwnerCacheMixin:
+    """
+    Caches responses of `list` & `retrieve` per view, user and query
+    parameters, until any object of the user is saved or deleted or
+    `cache_timeout` expires. Use it before Owner*APIView classes, i.e.
+    `class View(OwnerCacheMixin, OwnerListAPIView)`.
+
+    Only the owner's objects of the view's model are tracked, so
+    responses are cached only when the view is strictly owner scoped,
+    see `is_cacheable`. Cached responses of a retrieve skip object
+    level permission checks, which passed when the response was cached.
+    """
+
+    cache_timeout = 300
+
+    @classmethod
+    def get_cache_stats(cls):
+        if "_cache_stats" not in cls.__dict__:
+            cls._cache_stats = CacheStats()
+        return cls._cache_stats
+
+    def get_cache_key(self, action, request, *args, **kwargs):
+        model = self.get_queryset().model
+        version = get_owner_version(model, request.user.pk)
+        params = hashlib.sha256(
+            repr(
+                (sorted(request.query_params.lists()), args, sorted(kwargs.items()))
+            ).encode()
+        ).hexdigest()
+
+        return "drfaddons:view:{}.{}:{}:{}:{}:{}".format(
+            type(self).__module__,
+            type(self).__qualname__,
+            action,
+            request.user.pk,
+            version,
+            params,
+        )
+
+    def is_cacheable(self, request):
+        """
+        Checks if objects of the view are only those of request.user,
+        i.e. view filters with IsOwnerFilterBackend and the user isn't
+        privileged to see all objects via IsOwnerOrSuperuser.
+        """
+        from .filters import IsOwnerFilterBackend
+        from .filters import IsOwnerOrSuperuser
+        from .filters import is_privileged
+
+        if not request.user.is_authenticated:
+            return False
+        if not any(issubclass(b, IsOwnerFilterBackend) for b in self.filter_backends):
+            return False
+        return not (
+            any(issubclass(b, IsOwnerOrSuperuser) for b in self.filter_backends)
+            and is_privileged(request)
+        )
+
+    def cached_response(self, action, handler, request, *args, **kwargs):
+        from rest_framework import status
+        from rest_framework.response import Response
+
+        if not self.is_cacheable(request):
+            return handler(request, *args, **kwargs)
+
+        key = self.get_cache_key(action, request, *args, **kwargs)
+        data = get_cache().get(key)
+        if data is not None:
+            self.get_cache_stats().hit()
+            return Response(data)
+
+        self.get_cache_stats().miss()
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            get_cache().set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            "list", super(OwnerCacheMixin, self).list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            "retrieve", super(OwnerCacheMixin, self).retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,219 @@
+"""
+In-process queue that delivers messages of `utils.send_message` outside
+of the request cycle.
+
+Messages are drained by a background thread in batches. Every batch
+shares one mail connection and failed messages are retried with
+exponential backoff. No broker is required. For mobile numbers, the
+fallback email is sent once and only SMS is retried.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+
+class QueuedMessage:
+    """
+    A message waiting in MessageQueue, along with the Future that
+    receives the output of `send_message`.
+    """
+
+    __slots__ = ("kwargs", "future", "attempts", "sms_only")
+
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.future = Future()
+        self.attempts = 0
+        # Set once fallback email of an SMS went out, retries send SMS only
+        self.sms_only = False
+
+
+def send_sms(message, recip, **kwargs):
+    """
+    Sends SMS of a message of `send_message`, without fallback email.
+    Returns `success` & `message` same as `send_message`.
+    """
+    from sendsms import api
+
+    from .utils import get_mobile_number
+
+    try:
+        api.send_sms(
+            body=message, to=[get_mobile_number(rcp) for rcp in recip], from_phone=None
+        )
+    except Exception as ex:
+        return {"success": False, "message": "Message sending Failed!" + str(ex.args)}
+    return {"success": True, "message": "Message sent successfully!"}
+
+
+class MessageQueue:
+    """
+    Delivers messages of `send_message` from a background thread.
+
+    Parameters
+    ----------
+    batch_size: int
+        Maximum number of messages delivered over one mail connection.
+    retries: int
+        Number of retries of a message whose delivery failed.
+    backoff: float
+        Seconds to wait before first retry, doubled on every retry.
+    """
+
+    def __init__(self, batch_size=100, retries=3, backoff=1.0):
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def put(self, **kwargs):
+        """
+        Enqueues a message and returns immediately.
+
+        Parameters
+        ----------
+        kwargs: dict
+            Keyword arguments of `send_message`.
+
+        Returns
+        -------
+        result: concurrent.futures.Future
+            Resolves to the output of `send_message` once the message
+            has been delivered or all retries have failed.
+        """
+        message = QueuedMessage(kwargs)
+        with self._lock:
+            self._pending.add(message.future)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="drfaddons-delivery", daemon=True
+                )
+                self._worker.start()
+
+        message.future.add_done_callback(self._discard)
+        self._queue.put(message)
+        return message.future
+
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def flush(self, timeout=None):
+        """
+        Waits until every enqueued message has been delivered or has
+        failed.
+
+        Returns
+        -------
+        bool: False if timeout expired first.
+        """
+        from concurrent.futures import wait
+
+        with self._lock:
+            pending = set(self._pending)
+        return not wait(pending, timeout=timeout).not_done
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._deliver(batch)
+            except Exception as ex:
+                # Never let the worker die, fail what is unresolved
+                for message in batch:
+                    if not message.future.done():
+                        message.future.set_exception(ex)
+
+    def _send(self, message, connection):
+        from .utils import classify_recipient
+        from .utils import send_message
+
+        if message.sms_only:
+            return send_sms(**message.kwargs)
+
+        sent = send_message(connection=connection, queued=False, **message.kwargs)
+        if (
+            not sent["success"]
+            and not classify_recipient(message.kwargs["recip"][0])[0]
+        ):
+            # SMS failed after fallback email was sent
+            message.sms_only = True
+        return sent
+
+    def _deliver(self, batch):
+        failed = []
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as ex:
+            # Connection could not be opened, retry whole batch.
+            failed = [(message, None, ex) for message in batch]
+        else:
+            try:
+                for message in batch:
+                    try:
+                        sent = self._send(message, connection)
+                    except Exception as ex:
+                        failed.append((message, None, ex))
+                    else:
+                        if sent["success"]:
+                            message.future.set_result(sent)
+                        else:
+                            failed.append((message, sent, None))
+            finally:
+                try:
+                    connection.close()
+                except Exception:
+                    # Messages were handed over already, don't resend
+                    pass
+
+        for message, sent, ex in failed:
+            if isinstance(ex, ValueError) or message.attempts >= self.retries:
+                # Invalid messages will never succeed.
+                if ex is None:
+                    message.future.set_result(sent)
+                else:
+                    message.future.set_exception(ex)
+                continue
+
+            delay = self.backoff * 2 ** message.attempts
+            message.attempts += 1
+            timer = threading.Timer(delay, self._queue.put, args=(message,))
+            timer.daemon = True
+            timer.start()
+
+
+_message_queue = None
+_message_queue_lock = threading.Lock()
+
+
+def get_message_queue():
+    """
+    Returns the process wide MessageQueue, configured with
+    `DRFADDONS_QUEUE_BATCH_SIZE` (default: 100), `DRFADDONS_QUEUE_RETRIES`
+    (default: 3) and `DRFADDONS_QUEUE_BACKOFF` (default: 1.0) settings.
+    """
+    global _message_queue
+
+    with _message_queue_lock:
+        if _message_queue is None:
+            _message_queue = MessageQueue(
+                batch_size=getattr(settings, "DRFADDONS_QUEUE_BATCH_SIZE", 100),
+                retries=getattr(settings, "DRFADDONS_QUEUE_RETRIES", 3),
+                backoff=getattr(settings, "DRFADDONS_QUEUE_BACKOFF", 1.0),
+            )
+        return _message_queue
@@ -3,9 +3,45 @@ Custom filters that are used in generics API Views
 
 Author: Himanshu Shankar (https://himanshus.com)
 """
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
 from rest_framework.filters import BaseFilterBackend
 
 
+@lru_cache(maxsize=None)
+def _get_privileged_check(path):
+    if path is None:
+        return lambda user: user.is_superuser
+    return import_string(path)
+
+
+def is_privileged(request):
+    """
+    Checks if `request.user` may see all objects, via the callable set
+    as dotted path in `DRFADDONS_PRIVILEGED_USER` setting (default:
+    `user.is_superuser`). The result is stored on request, so it is
+    evaluated once per request.
+
+    Parameters
+    ----------
+    request: Request
+
+    Returns
+    -------
+    bool
+    """
+    if not hasattr(request, "_drfaddons_privileged"):
+        check = _get_privileged_check(
+            getattr(settings, "DRFADDONS_PRIVILEGED_USER", None)
+        )
+        request._drfaddons_privileged = bool(
+            request.user.is_authenticated and check(request.user)
+        )
+    return request._drfaddons_privileged
+
+
 class IsOwnerFilterBackend(BaseFilterBackend):
     """
     Filters data as per ownership
@@ -13,19 +49,48 @@ class IsOwnerFilterBackend(BaseFilterBackend):
     """
 
     def filter_queryset(self, request, queryset, view):
-        return queryset.filter(created_by=request.user)
+        if not request.user.is_authenticated:
+            return queryset.none()
+        # Filter on column itself to not join with user table
+        return queryset.filter(created_by_id=request.user.pk)
 
 
 class IsOwnerOrSuperuser(IsOwnerFilterBackend):
     """
-    Filters data as per ownership, is user is not a superuser
+    Filters data as per ownership, is user is not a superuser (or
+    privileged, see `is_privileged`)
 
     Author: Himanshu Shankar (https://himanshus.com)
     """
 
     def filter_queryset(self, request, queryset, view):
-        if not request.user.is_superuser:
+        if not is_privileged(request):
             return super(IsOwnerOrSuperuser, self).filter_queryset(
-                request=request, queryset=request, view=view
+                request=request, queryset=queryset, view=view
+            )
+        return queryset
+
+
+class HasPermissionFilterBackend(BaseFilterBackend):
+    """
+    Filters data as per object level permission, i.e.
+    `has_permission` evaluated in a single query via
+    `permission_filter` of model.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        return queryset.filter(queryset.model.permission_filter(request.user))
+
+
+class HasPermissionOrSuperuser(HasPermissionFilterBackend):
+    """
+    Filters data as per object level permission, if user is not a
+    superuser (or privileged, see `is_privileged`)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_privileged(request):
+            return super(HasPermissionOrSuperuser, self).filter_queryset(
+                request=request, queryset=queryset, view=view
             )
         return queryset
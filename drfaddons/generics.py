@@ -4,12 +4,23 @@ CreateUpdateModel.
 
 Author: Himanshu Shankar (https://himanshus.com)
 """
+
 from __future__ import unicode_literals
 
 from rest_framework import mixins
 from rest_framework.generics import GenericAPIView
 
+from .mixins import AsyncDestroyModelMixin
+from .mixins import AsyncOwnerCreateModelMixin
+from .mixins import AsyncOwnerListModelMixin
+from .mixins import AsyncOwnerRetrieveModelMixin
+from .mixins import AsyncUpdateModelMixin
+from .mixins import OwnerBulkCreateModelMixin
+from .mixins import OwnerBulkDestroyModelMixin
+from .mixins import OwnerBulkUpdateModelMixin
 from .mixins import OwnerCreateModelMixin
+from .mixins import OwnerListModelMixin
+from .mixins import OwnerRetrieveModelMixin
 
 
 class OwnerGenericAPIView(GenericAPIView):
@@ -34,6 +45,91 @@ class OwnerGenericAPIView(GenericAPIView):
     renderer_classes = (JSONRenderer,)
     parser_classes = (JSONParser,)
 
+    # Adds ETag & Last-Modified, based on update_date, in list and
+    # retrieve responses and answers conditional requests with 304.
+    conditional_get = False
+
+    # Applies select_related, prefetch_related & only (for safe
+    # methods) as needed by fields of serializer_class.
+    optimize_queryset = False
+
+    def get_query_plan(self, model):
+        """
+        Returns query plan of serializer class, derived once and
+        cached per view class.
+        """
+        from .serializers import get_query_plan
+
+        cls = type(self)
+        if "_query_plans" not in cls.__dict__:
+            cls._query_plans = {}
+
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in cls._query_plans:
+            plan = get_query_plan(serializer_class, model)
+            if plan["only"] is not None:
+                # Used by ownership checks and conditional requests
+                plan["only"].update(("created_by", "update_date"))
+            cls._query_plans[serializer_class] = plan
+        return cls._query_plans[serializer_class]
+
+    def get_queryset(self):
+        from rest_framework.permissions import SAFE_METHODS
+        from .serializers import apply_query_plan
+
+        queryset = super(OwnerGenericAPIView, self).get_queryset()
+        if self.optimize_queryset:
+            queryset = apply_query_plan(
+                queryset,
+                self.get_query_plan(queryset.model),
+                only=self.request.method in SAFE_METHODS,
+            )
+        return queryset
+
+    def get_object_validators(self, obj):
+        """Returns ETag & Last-Modified timestamp of an object"""
+        timestamp = obj.update_date.timestamp()
+        return '"{}-{}"'.format(obj.pk, timestamp), int(timestamp)
+
+    def get_list_validators(self, queryset):
+        """
+        Returns ETag & Last-Modified timestamp of a queryset, via a
+        single aggregate query
+        """
+        from django.db.models import Count
+        from django.db.models import Max
+
+        aggregate = queryset.order_by().aggregate(
+            last_modified=Max("update_date"), count=Count("pk")
+        )
+        if aggregate["last_modified"] is None:
+            return '"0"', None
+
+        timestamp = aggregate["last_modified"].timestamp()
+        return '"{}-{}"'.format(aggregate["count"], timestamp), int(timestamp)
+
+    def get_conditional_response(self, request, etag, last_modified, handler):
+        """
+        Returns 304 Not Modified if client's copy is fresh, else the
+        response of handler. Validators are added to both.
+        """
+        from django.utils.cache import get_conditional_response
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler()
+        return self.set_validators(response, etag, last_modified)
+
+    def set_validators(self, response, etag, last_modified):
+        from django.utils.http import http_date
+
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
 
 class GenericByUserAPIView(OwnerGenericAPIView):
     """
@@ -50,6 +146,125 @@ class GenericByUserAPIView(OwnerGenericAPIView):
         return super(GenericByUserAPIView, self).get_object()
 
 
+class AsyncOwnerGenericAPIView(OwnerGenericAPIView):
+    """
+    Base class for async (ASGI) generic views based on
+    CreateUpdateModel. Objects are filtered, looked up and checked for
+    ownership with Django's async ORM, so that database waits don't
+    hold a thread. Authentication and serializers, which are
+    synchronous, run via `sync_to_async`.
+    Requires Django 4.2+.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Same as `APIView.dispatch`, but awaits handlers, which have to
+        be coroutines (except `options`).
+        """
+        import inspect
+        from asgiref.sync import sync_to_async
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authenticators may query the database, `initial` then
+            # uses the authenticated user
+            await sync_to_async(self.perform_authentication)(request)
+            self.initial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aget_object(self):
+        """
+        Returns the object the view is displaying, same as
+        `get_object`, via `QuerySet.aget`.
+        """
+        from asgiref.sync import sync_to_async
+        from django.core.exceptions import ValidationError
+        from django.http import Http404
+
+        # Filter backends may query, e.g. to validate a related filter
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        assert lookup_url_kwarg in self.kwargs, (
+            "Expected view %s to be called with a URL keyword argument "
+            'named "%s". Fix your URL conf, or set the `.lookup_field` '
+            "attribute on the view correctly."
+            % (self.__class__.__name__, lookup_url_kwarg)
+        )
+
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def aget_list_validators(self, queryset):
+        """Same as `get_list_validators`, via `QuerySet.aaggregate`"""
+        from django.db.models import Count
+        from django.db.models import Max
+
+        aggregate = await queryset.order_by().aaggregate(
+            last_modified=Max("update_date"), count=Count("pk")
+        )
+        if aggregate["last_modified"] is None:
+            return '"0"', None
+
+        timestamp = aggregate["last_modified"].timestamp()
+        return '"{}-{}"'.format(aggregate["count"], timestamp), int(timestamp)
+
+    async def aget_conditional_response(self, request, etag, last_modified, handler):
+        """
+        Same as `get_conditional_response`, where handler returns an
+        awaitable.
+        """
+        from django.utils.cache import get_conditional_response
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = await handler()
+        return self.set_validators(response, etag, last_modified)
+
+
+class AsyncGenericByUserAPIView(AsyncOwnerGenericAPIView):
+    """
+    Async version of GenericByUserAPIView, where object is retrieved via
+    logged in user and does not requires a primary key.
+    """
+
+    lookup_field = "created_by"
+
+    async def aget_object(self):
+        """Returns the object the view is displaying"""
+        self.kwargs[self.lookup_field] = self.request.user
+        return await super(AsyncGenericByUserAPIView, self).aget_object()
+
+
 # Concrete view classes that provide method handlers
 # by composing the mixin classes with the base view.
 # Only for CreateUpdateModel this package
@@ -62,14 +277,14 @@ class OwnerCreateAPIView(OwnerCreateModelMixin, OwnerGenericAPIView):
         return self.create(request, *args, **kwargs)
 
 
-class OwnerListAPIView(mixins.ListModelMixin, OwnerGenericAPIView):
+class OwnerListAPIView(OwnerListModelMixin, OwnerGenericAPIView):
     """Concrete view for listing a CreateUpdateModel based queryset."""
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
-class OwnerRetrieveAPIView(mixins.RetrieveModelMixin, OwnerGenericAPIView):
+class OwnerRetrieveAPIView(OwnerRetrieveModelMixin, OwnerGenericAPIView):
     """Concrete view for retrieving a CreateUpdateModel based model instance."""
 
     def get(self, request, *args, **kwargs):
@@ -94,7 +309,7 @@ class OwnerUpdateAPIView(mixins.UpdateModelMixin, OwnerGenericAPIView):
 
 
 class OwnerListCreateAPIView(
-    mixins.ListModelMixin, OwnerCreateModelMixin, OwnerGenericAPIView
+    OwnerListModelMixin, OwnerCreateModelMixin, OwnerGenericAPIView
 ):
     """
     Concrete view for listing a queryset or creating a
@@ -109,7 +324,7 @@ class OwnerListCreateAPIView(
 
 
 class OwnerRetrieveUpdateAPIView(
-    mixins.RetrieveModelMixin, mixins.UpdateModelMixin, OwnerGenericAPIView
+    OwnerRetrieveModelMixin, mixins.UpdateModelMixin, OwnerGenericAPIView
 ):
     """
     Concrete view for retrieving, updating a CreateUpdateModel based
@@ -127,7 +342,7 @@ class OwnerRetrieveUpdateAPIView(
 
 
 class OwnerRetrieveDestroyAPIView(
-    mixins.RetrieveModelMixin, mixins.DestroyModelMixin, OwnerGenericAPIView
+    OwnerRetrieveModelMixin, mixins.DestroyModelMixin, OwnerGenericAPIView
 ):
     """
     Concrete view for retrieving or deleting a CreateUpdateModel based
@@ -142,7 +357,7 @@ class OwnerRetrieveDestroyAPIView(
 
 
 class OwnerRetrieveUpdateDestroyAPIView(
-    mixins.RetrieveModelMixin,
+    OwnerRetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
     OwnerGenericAPIView,
@@ -165,7 +380,64 @@ class OwnerRetrieveUpdateDestroyAPIView(
         return self.destroy(request, *args, **kwargs)
 
 
-class RetrieveByUserAPIView(mixins.RetrieveModelMixin, GenericByUserAPIView):
+class OwnerBulkCreateAPIView(OwnerBulkCreateModelMixin, OwnerGenericAPIView):
+    """
+    Concrete view for creating many CreateUpdateModel based model
+    instances from a list.
+    """
+
+    def post(self, request, *args, **kwargs):
+        return self.bulk_create(request, *args, **kwargs)
+
+
+class OwnerBulkUpdateAPIView(OwnerBulkUpdateModelMixin, OwnerGenericAPIView):
+    """
+    Concrete view for updating many CreateUpdateModel based model
+    instances from a list.
+    """
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(request, *args, **kwargs)
+
+    def patch(self, request, *args, **kwargs):
+        return self.partial_bulk_update(request, *args, **kwargs)
+
+
+class OwnerBulkDestroyAPIView(OwnerBulkDestroyModelMixin, OwnerGenericAPIView):
+    """
+    Concrete view for deleting many CreateUpdateModel based model
+    instances from a list of ids.
+    """
+
+    def delete(self, request, *args, **kwargs):
+        return self.bulk_destroy(request, *args, **kwargs)
+
+
+class OwnerBulkCreateUpdateDestroyAPIView(
+    OwnerBulkCreateModelMixin,
+    OwnerBulkUpdateModelMixin,
+    OwnerBulkDestroyModelMixin,
+    OwnerGenericAPIView,
+):
+    """
+    Concrete view for creating, updating or deleting many
+    CreateUpdateModel based model instances from a list.
+    """
+
+    def post(self, request, *args, **kwargs):
+        return self.bulk_create(request, *args, **kwargs)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(request, *args, **kwargs)
+
+    def patch(self, request, *args, **kwargs):
+        return self.partial_bulk_update(request, *args, **kwargs)
+
+    def delete(self, request, *args, **kwargs):
+        return self.bulk_destroy(request, *args, **kwargs)
+
+
+class RetrieveByUserAPIView(OwnerRetrieveModelMixin, GenericByUserAPIView):
     """
     Concrete view for retrieving a CreateUpdateModel based model
     instance where One-to-One relationship exists on created_by with
@@ -201,7 +473,7 @@ class DestroyByUserAPIView(mixins.DestroyModelMixin, GenericByUserAPIView):
 
 
 class RetrieveUpdateByUserAPIView(
-    mixins.RetrieveModelMixin, mixins.UpdateModelMixin, GenericByUserAPIView
+    OwnerRetrieveModelMixin, mixins.UpdateModelMixin, GenericByUserAPIView
 ):
     """
     Concrete view for retrieving, updating a CreateUpdateModel based
@@ -220,7 +492,7 @@ class RetrieveUpdateByUserAPIView(
 
 
 class RetrieveDestroyByUserAPIView(
-    mixins.RetrieveModelMixin, mixins.DestroyModelMixin, GenericByUserAPIView
+    OwnerRetrieveModelMixin, mixins.DestroyModelMixin, GenericByUserAPIView
 ):
     """
     Concrete view for retrieving or deleting a CreateUpdateModel based
@@ -236,7 +508,7 @@ class RetrieveDestroyByUserAPIView(
 
 
 class RetrieveUpdateDestroyByUserAPIView(
-    mixins.RetrieveModelMixin,
+    OwnerRetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
     GenericByUserAPIView,
@@ -262,7 +534,7 @@ class RetrieveUpdateDestroyByUserAPIView(
 
 class CreateRetrieveUpdateDestroyByUserAPIView(
     OwnerCreateModelMixin,
-    mixins.RetrieveModelMixin,
+    OwnerRetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
     GenericByUserAPIView,
@@ -287,3 +559,240 @@ class CreateRetrieveUpdateDestroyByUserAPIView(
 
     def delete(self, request, *args, **kwargs):
         return self.destroy(request, *args, **kwargs)
+
+
+# Async concrete view classes, counterparts of the ones above
+
+
+class AsyncOwnerCreateAPIView(AsyncOwnerCreateModelMixin, AsyncOwnerGenericAPIView):
+    """Async view for creating a CreateUpdateModel based model instance."""
+
+    async def post(self, request, *args, **kwargs):
+        return await self.create(request, *args, **kwargs)
+
+
+class AsyncOwnerListAPIView(AsyncOwnerListModelMixin, AsyncOwnerGenericAPIView):
+    """Async view for listing a CreateUpdateModel based queryset."""
+
+    async def get(self, request, *args, **kwargs):
+        return await self.list(request, *args, **kwargs)
+
+
+class AsyncOwnerRetrieveAPIView(AsyncOwnerRetrieveModelMixin, AsyncOwnerGenericAPIView):
+    """Async view for retrieving a CreateUpdateModel based model instance."""
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+
+class AsyncOwnerDestroyAPIView(AsyncDestroyModelMixin, AsyncOwnerGenericAPIView):
+    """Async view for deleting a CreateUpdateModel based model instance."""
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+
+class AsyncOwnerUpdateAPIView(AsyncUpdateModelMixin, AsyncOwnerGenericAPIView):
+    """Async view for updating a CreateUpdateModel based model instance."""
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+
+class AsyncOwnerListCreateAPIView(
+    AsyncOwnerListModelMixin, AsyncOwnerCreateModelMixin, AsyncOwnerGenericAPIView
+):
+    """
+    Async view for listing a queryset or creating a CreateUpdateModel
+    based model instance.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.list(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.create(request, *args, **kwargs)
+
+
+class AsyncOwnerRetrieveUpdateAPIView(
+    AsyncOwnerRetrieveModelMixin, AsyncUpdateModelMixin, AsyncOwnerGenericAPIView
+):
+    """
+    Async view for retrieving, updating a CreateUpdateModel based model
+    instance.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+
+class AsyncOwnerRetrieveDestroyAPIView(
+    AsyncOwnerRetrieveModelMixin, AsyncDestroyModelMixin, AsyncOwnerGenericAPIView
+):
+    """
+    Async view for retrieving or deleting a CreateUpdateModel based
+    model instance.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+
+class AsyncOwnerRetrieveUpdateDestroyAPIView(
+    AsyncOwnerRetrieveModelMixin,
+    AsyncUpdateModelMixin,
+    AsyncDestroyModelMixin,
+    AsyncOwnerGenericAPIView,
+):
+    """
+    Async view for retrieving, updating or deleting a CreateUpdateModel
+    based model instance.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+
+class AsyncRetrieveByUserAPIView(
+    AsyncOwnerRetrieveModelMixin, AsyncGenericByUserAPIView
+):
+    """
+    Async view for retrieving a CreateUpdateModel based model instance
+    where One-to-One relationship exists on created_by with User.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+
+class AsyncUpdateByUserAPIView(AsyncUpdateModelMixin, AsyncGenericByUserAPIView):
+    """
+    Async view for updating a CreateUpdateModel based model instance
+    where One-to-One relationship exists on created_by with User.
+    """
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+
+class AsyncDestroyByUserAPIView(AsyncDestroyModelMixin, AsyncGenericByUserAPIView):
+    """
+    Async view for deleting a CreateUpdateModel based model instance
+    where One-to-One relationship exists on created_by with User.
+    """
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+
+class AsyncRetrieveUpdateByUserAPIView(
+    AsyncOwnerRetrieveModelMixin, AsyncUpdateModelMixin, AsyncGenericByUserAPIView
+):
+    """
+    Async view for retrieving, updating a CreateUpdateModel based model
+    instance where One-to-One relationship exists on created_by with
+    User.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+
+class AsyncRetrieveDestroyByUserAPIView(
+    AsyncOwnerRetrieveModelMixin, AsyncDestroyModelMixin, AsyncGenericByUserAPIView
+):
+    """
+    Async view for retrieving or deleting a CreateUpdateModel based
+    model instance where One-to-One relationship exists on created_by
+    with User.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+
+class AsyncRetrieveUpdateDestroyByUserAPIView(
+    AsyncOwnerRetrieveModelMixin,
+    AsyncUpdateModelMixin,
+    AsyncDestroyModelMixin,
+    AsyncGenericByUserAPIView,
+):
+    """
+    Async view for retrieving, updating or deleting a CreateUpdateModel
+    based model instance where One-to-One relationship exists on
+    created_by with User.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
+
+
+class AsyncCreateRetrieveUpdateDestroyByUserAPIView(
+    AsyncOwnerCreateModelMixin,
+    AsyncOwnerRetrieveModelMixin,
+    AsyncUpdateModelMixin,
+    AsyncDestroyModelMixin,
+    AsyncGenericByUserAPIView,
+):
+    """
+    Async view for adding, retrieving, updating or deleting a
+    CreateUpdateModel based model instance where One-to-One
+    relationship exists on created_by with User.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        return await self.retrieve(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        return await self.create(request, *args, **kwargs)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.partial_update(request, *args, **kwargs)
+
+    async def delete(self, request, *args, **kwargs):
+        return await self.destroy(request, *args, **kwargs)
@@ -3,9 +3,14 @@ Custom Mixins for future use cases.
 
 Author: Himanshu Shankar (https://himanshus.com)
 """
+
 from __future__ import unicode_literals
 
 from rest_framework.mixins import CreateModelMixin
+from rest_framework.mixins import DestroyModelMixin
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.mixins import UpdateModelMixin
 
 
 class OwnerCreateModelMixin(CreateModelMixin):
@@ -17,3 +22,350 @@ class OwnerCreateModelMixin(CreateModelMixin):
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+
+
+class OwnerListModelMixin(ListModelMixin):
+    """
+    List a CreateUpdateModel based queryset.
+    If `conditional_get` is set on view, responds with 304 Not Modified
+    when client's copy is fresh, as per `Max(update_date)` and count of
+    objects computed in one aggregate query.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not self.conditional_get:
+            return super(OwnerListModelMixin, self).list(request, *args, **kwargs)
+
+        return self.get_conditional_response(
+            request,
+            *self.get_list_validators(self.filter_queryset(self.get_queryset())),
+            handler=lambda: super(OwnerListModelMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+
+class OwnerRetrieveModelMixin(RetrieveModelMixin):
+    """
+    Retrieve a CreateUpdateModel based model instance.
+    If `conditional_get` is set on view, responds with 304 Not Modified
+    before serializing when client's copy is fresh, as per
+    `update_date` of the instance.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        from rest_framework.response import Response
+
+        instance = self.get_object()
+        if not self.conditional_get:
+            return Response(self.get_serializer(instance).data)
+
+        return self.get_conditional_response(
+            request,
+            *self.get_object_validators(instance),
+            handler=lambda: Response(self.get_serializer(instance).data)
+        )
+
+
+class OwnerBulkModelMixin:
+    """
+    Common functionality of bulk mixins.
+    Objects are looked up with `bulk_lookup_field` from every item of
+    request data and ownership is enforced by filtering all of them
+    in a single query via the view's filter backends.
+    """
+
+    bulk_lookup_field = "id"
+
+    def get_bulk_ids(self, values):
+        from django.core.exceptions import ValidationError as DjangoValidationError
+        from rest_framework.exceptions import ValidationError
+
+        pk = self.get_queryset().model._meta.pk
+        try:
+            ids = [pk.to_python(value) for value in values]
+        except DjangoValidationError as ex:
+            raise ValidationError({self.bulk_lookup_field: ex.messages})
+
+        if None in ids or len(set(ids)) != len(ids):
+            raise ValidationError(
+                {self.bulk_lookup_field: ["Every item should have a unique value."]}
+            )
+        return ids
+
+    def get_bulk_queryset(self, ids):
+        return self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+
+    def get_bulk_data(self):
+        from rest_framework.exceptions import ValidationError
+
+        if not isinstance(self.request.data, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of items."]})
+        return self.request.data
+
+    def invalidate_bulk(self, model, owner_ids):
+        # Bulk queries don't send signals, invalidate cached responses
+        from .cache import invalidate_owner_cache
+
+        for owner_id in set(owner_ids):
+            invalidate_owner_cache(model, owner_id)
+
+
+class OwnerBulkCreateModelMixin(OwnerBulkModelMixin):
+    """
+    Create many CreateUpdateModel based model instances via
+    `bulk_create`, in a single transaction.
+    Serializer may not have many-to-many fields. If serializer overrides
+    `create()`, or database doesn't return primary keys from bulk
+    inserts, instances are created one by one via `serializer.save()`.
+    """
+
+    def bulk_create(self, request, *args, **kwargs):
+        from rest_framework import status
+        from rest_framework.response import Response
+
+        serializer = self.get_serializer(data=self.get_bulk_data(), many=True)
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def can_bulk_create(self, serializer, model):
+        from django.db import connections
+        from django.db import router
+        from rest_framework.serializers import ModelSerializer
+
+        features = connections[router.db_for_write(model)].features
+        return (
+            type(serializer.child).create is ModelSerializer.create
+            and features.can_return_rows_from_bulk_insert
+        )
+
+    def perform_bulk_create(self, serializer):
+        from django.db import transaction
+
+        model = self.get_queryset().model
+        if not self.can_bulk_create(serializer, model):
+            with transaction.atomic():
+                serializer.save(created_by=self.request.user)
+            return
+
+        objects = [
+            model(**dict(attrs, created_by=self.request.user))
+            for attrs in serializer.validated_data
+        ]
+        with transaction.atomic():
+            serializer.instance = model.objects.bulk_create(objects)
+        self.invalidate_bulk(model, [self.request.user.pk])
+
+
+class OwnerBulkUpdateModelMixin(OwnerBulkModelMixin):
+    """
+    Update many CreateUpdateModel based model instances via
+    `bulk_update`, in a single transaction. Every item of request data
+    must have `bulk_lookup_field`.
+    Serializer may not have many-to-many fields.
+    """
+
+    def bulk_update(self, request, *args, **kwargs):
+        from django.http import Http404
+        from rest_framework.exceptions import ValidationError
+        from rest_framework.response import Response
+
+        partial = kwargs.pop("partial", False)
+        data = self.get_bulk_data()
+        ids = self.get_bulk_ids(
+            item.get(self.bulk_lookup_field) if isinstance(item, dict) else None
+            for item in data
+        )
+
+        instances = {obj.pk: obj for obj in self.get_bulk_queryset(ids)}
+        if len(instances) != len(ids):
+            raise Http404
+
+        serializers = [
+            self.get_serializer(instances[pk], data=item, partial=partial)
+            for pk, item in zip(ids, data)
+        ]
+        errors = [{} if s.is_valid() else s.errors for s in serializers]
+        if any(errors):
+            raise ValidationError(errors)
+
+        self.perform_bulk_update(serializers)
+        return Response([s.data for s in serializers])
+
+    def partial_bulk_update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return self.bulk_update(request, *args, **kwargs)
+
+    def perform_bulk_update(self, serializers):
+        from django.db import transaction
+        from django.utils import timezone
+
+        model = self.get_queryset().model
+        # bulk_update doesn't set auto_now fields
+        fields = {"update_date"}
+        now = timezone.now()
+
+        for serializer in serializers:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+                fields.add(attr)
+            serializer.instance.update_date = now
+
+        instances = [serializer.instance for serializer in serializers]
+        with transaction.atomic():
+            model.objects.bulk_update(instances, fields)
+        self.invalidate_bulk(model, [obj.created_by_id for obj in instances])
+
+
+class OwnerBulkDestroyModelMixin(OwnerBulkModelMixin):
+    """
+    Delete many CreateUpdateModel based model instances, whose
+    `bulk_lookup_field` values are sent as a list, in a single
+    transaction. Objects are deleted with a single filtered queryset
+    `delete()`; as `drfaddons.cache` connects delete receivers, Django
+    fetches objects before the `DELETE ... WHERE pk IN (...)`.
+    """
+
+    def bulk_destroy(self, request, *args, **kwargs):
+        from rest_framework import status
+        from rest_framework.response import Response
+
+        self.perform_bulk_destroy(self.get_bulk_ids(self.get_bulk_data()))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_bulk_destroy(self, ids):
+        from django.db import transaction
+        from django.http import Http404
+
+        model = self.get_queryset().model
+        with transaction.atomic():
+            owned = list(self.get_bulk_queryset(ids).values_list("pk", "created_by_id"))
+            if len(owned) != len(ids):
+                raise Http404
+
+            self.get_bulk_queryset(ids).delete()
+        self.invalidate_bulk(model, [owner_id for _, owner_id in owned])
+
+
+# Mixins of async views, i.e. AsyncOwnerGenericAPIView subclasses.
+# Objects are fetched with Django's async ORM, serializers must not
+# lazily load relations (see `optimize_queryset`).
+
+
+class AsyncOwnerCreateModelMixin(OwnerCreateModelMixin):
+    """
+    Create a CreateUpdateModel based model instance.
+    Serializers are synchronous, so validation and save run via
+    `sync_to_async`.
+    """
+
+    async def create(self, request, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(super(AsyncOwnerCreateModelMixin, self).create)(
+            request, *args, **kwargs
+        )
+
+
+class AsyncOwnerListModelMixin:
+    """
+    List a CreateUpdateModel based queryset via async iteration, or
+    via `sync_to_async` if view has pagination.
+    If `conditional_get` is set on view, responds with 304 Not Modified
+    when client's copy is fresh, same as OwnerListModelMixin.
+    """
+
+    async def list(self, request, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+
+        # Filter backends may query, e.g. to validate a related filter
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        if not self.conditional_get:
+            return await self.get_list_response(queryset)
+
+        return await self.aget_conditional_response(
+            request,
+            *await self.aget_list_validators(queryset),
+            handler=lambda: self.get_list_response(queryset)
+        )
+
+    async def get_list_response(self, queryset):
+        from asgiref.sync import sync_to_async
+        from rest_framework.response import Response
+
+        if self.paginator is not None:
+            page = await sync_to_async(self.paginate_queryset)(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+        objects = [obj async for obj in queryset]
+        return Response(self.get_serializer(objects, many=True).data)
+
+
+class AsyncOwnerRetrieveModelMixin:
+    """
+    Retrieve a CreateUpdateModel based model instance, looked up via
+    `aget_object`.
+    If `conditional_get` is set on view, responds with 304 Not Modified
+    when client's copy is fresh, same as OwnerRetrieveModelMixin.
+    """
+
+    async def retrieve(self, request, *args, **kwargs):
+        from rest_framework.response import Response
+
+        instance = await self.aget_object()
+        if not self.conditional_get:
+            return Response(self.get_serializer(instance).data)
+
+        return self.get_conditional_response(
+            request,
+            *self.get_object_validators(instance),
+            handler=lambda: Response(self.get_serializer(instance).data)
+        )
+
+
+class AsyncUpdateModelMixin(UpdateModelMixin):
+    """
+    Update a model instance, looked up via `aget_object`.
+    Serializers are synchronous, so validation and save run via
+    `sync_to_async`.
+    """
+
+    async def update(self, request, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+        from rest_framework.response import Response
+
+        partial = kwargs.pop("partial", False)
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+
+        def perform_update():
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+            if getattr(instance, "_prefetched_objects_cache", None):
+                instance._prefetched_objects_cache = {}
+            return serializer.data
+
+        return Response(await sync_to_async(perform_update)())
+
+    async def partial_update(self, request, *args, **kwargs):
+        kwargs["partial"] = True
+        return await self.update(request, *args, **kwargs)
+
+
+class AsyncDestroyModelMixin(DestroyModelMixin):
+    """
+    Delete a model instance, looked up via `aget_object`.
+    """
+
+    async def destroy(self, request, *args, **kwargs):
+        from rest_framework import status
+        from rest_framework.response import Response
+
+        await self.perform_destroy(await self.aget_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    async def perform_destroy(self, instance):
+        await instance.adelete()
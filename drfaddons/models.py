@@ -4,9 +4,32 @@ inherited for further use.
 
 Author: Himanshu Shankar
 """
+from django.conf import settings
 from django.db import models
 
 
+def owner_indexes():
+    """
+    Returns composite indexes on (created_by, create_date) and
+    (created_by, update_date), which let the database serve owner
+    scoped listings ordered by create/update date straight from an
+    index.
+
+    Can be used in Meta of any model inheriting CreateUpdateModel:
+    `indexes = owner_indexes()`. Set `DRFADDONS_OWNER_INDEXES = True`
+    to add them in every model that inherits CreateUpdateModel.Meta.
+    Either way, migrations need to be created afterwards.
+
+    Returns
+    -------
+    indexes: list
+    """
+    return [
+        models.Index(fields=["created_by", "create_date"]),
+        models.Index(fields=["created_by", "update_date"]),
+    ]
+
+
 class CreateUpdateModel(models.Model):
     """
     An abstract model that provides 3 field in every inherited model.
@@ -41,7 +64,8 @@ class CreateUpdateModel(models.Model):
         Himanshu Shankar (https://himanshus.com)
         """
         if user.is_authenticated:
-            return self.created_by.id == user.id
+            # Compare raw column to not fetch created_by from database
+            return self.created_by_id == user.pk
         return False
 
     def has_permission(self, user):
@@ -62,5 +86,47 @@ class CreateUpdateModel(models.Model):
         """
         return self.is_owner(user)
 
+    @classmethod
+    def owner_filter(cls, user):
+        """
+        Returns a filter matching objects that are owned by user, i.e.
+        `is_owner` for a whole queryset.
+
+        Parameters
+        ----------
+        user: get_user_model() instance
+
+        Returns
+        -------
+        Q
+        """
+        from django.db.models import Q
+
+        if user.is_authenticated:
+            return Q(created_by_id=user.pk)
+        return Q(pk__in=[])
+
+    @classmethod
+    def permission_filter(cls, user):
+        """
+        Returns a filter matching objects on which user has permission,
+        i.e. `has_permission` for a whole queryset. Models overriding
+        `has_permission` should override this accordingly.
+
+        Parameters
+        ----------
+        user: get_user_model() instance
+
+        Returns
+        -------
+        Q
+        """
+        return cls.owner_filter(user)
+
     class Meta:
         abstract = True
+        indexes = (
+            owner_indexes()
+            if getattr(settings, "DRFADDONS_OWNER_INDEXES", False)
+            else []
+        )
@@ -3,23 +3,212 @@ Custom serializers
 
 Author: Himanshu Shankar (https://himanshus.com)
 """
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError
+from django.db import transaction
 from django.utils.text import gettext_lazy as _
 from rest_framework import serializers
 
 
 class ByOwnerSerializer(serializers.ModelSerializer):
+    """
+    Allows only one object per user.
+    If `created_by` is unique in database (e.g. a OneToOneField), no
+    query is made before creating and a duplicate is detected from the
+    IntegrityError raised by database, which is also safe against
+    concurrent requests. Otherwise, an `exists()` query is made first.
+    """
+
     created_by = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
-    def validate(self, attrs):
+    def owner_exists_error(self):
         model = self.Meta.model
 
-        if model.objects.filter(created_by=self.context["request"].user).count() > 0:
-            raise serializers.ValidationError(
-                detail=_(
-                    "Logged in user already has %s object."
-                    "Can not create another object."
-                    % (model._meta.verbose_name.title())
-                )
+        return serializers.ValidationError(
+            detail=_(
+                "Logged in user already has %s object."
+                "Can not create another object." % (model._meta.verbose_name.title())
             )
+        )
+
+    def is_owner_unique(self):
+        return self.Meta.model._meta.get_field("created_by").unique
+
+    def validate(self, attrs):
+        model = self.Meta.model
+
+        if (
+            self.instance is None
+            and isinstance(self.parent, serializers.ListSerializer)
+            and len(self.parent.initial_data) > 1
+        ):
+            # Many objects of one user in a bulk request
+            raise self.owner_exists_error()
+
+        if (
+            self.instance is None
+            and not self.is_owner_unique()
+            and model.objects.filter(created_by=self.context["request"].user).exists()
+        ):
+            raise self.owner_exists_error()
 
         return attrs
+
+    def create(self, validated_data):
+        if not self.is_owner_unique():
+            return super(ByOwnerSerializer, self).create(validated_data)
+
+        try:
+            with transaction.atomic():
+                return super(ByOwnerSerializer, self).create(validated_data)
+        except IntegrityError:
+            if self.Meta.model.objects.filter(
+                created_by=validated_data["created_by"]
+            ).exists():
+                raise self.owner_exists_error()
+            raise
+
+
+def _get_model_field(model, attr):
+    """
+    Returns field of model named attr. Reverse relations are looked up
+    by their accessor name (e.g. `note_set`), which is what serializers
+    use, rather than their query name (e.g. `note`).
+    """
+    for rel in model._meta.related_objects:
+        if rel.get_accessor_name() == attr:
+            return rel
+
+    model_field = model._meta.get_field(attr)
+    if model_field.auto_created and not model_field.concrete:
+        # Query name of a reverse relation isn't an attribute
+        raise FieldDoesNotExist(attr)
+    return model_field
+
+
+def _plan_fields(serializer, model, prefix, plan, many):
+    """
+    Walks readable fields of serializer and adds relations traversed by
+    them, in relation to model, into plan.
+    """
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            nested = field.child
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = field
+        else:
+            nested = None
+
+        if field.source == "*":
+            if nested is not None:
+                _plan_fields(nested, model, prefix, plan, many)
+            elif not prefix:
+                # e.g. SerializerMethodField, may use any attribute
+                plan["only"] = None
+            continue
+
+        current, path, is_many = model, prefix, many
+        for index, attr in enumerate(field.source_attrs):
+            try:
+                model_field = _get_model_field(current, attr)
+            except FieldDoesNotExist:
+                # Property or method, may use any attribute
+                if not path:
+                    plan["only"] = None
+                break
+
+            if (
+                not path
+                and plan["only"] is not None
+                and not model_field.many_to_many
+                and not model_field.one_to_many
+            ):
+                if model_field.concrete:
+                    plan["only"].add(attr)
+                else:
+                    # Reverse one-to-one can't be selected along only()
+                    plan["only"] = None
+
+            if not model_field.is_relation:
+                break
+
+            is_last = index == len(field.source_attrs) - 1
+            if (
+                is_last
+                and nested is None
+                and isinstance(field, serializers.PrimaryKeyRelatedField)
+                and model_field.many_to_one
+            ):
+                # Served from <attr>_id column without a query
+                break
+
+            path = path + "__" + attr if path else attr
+            is_many = is_many or model_field.many_to_many or model_field.one_to_many
+            plan["prefetch_related" if is_many else "select_related"].add(path)
+            current = model_field.related_model
+        else:
+            if nested is not None:
+                _plan_fields(nested, current, path, plan, is_many)
+
+
+def get_query_plan(serializer_class, model):
+    """
+    Derives `select_related`, `prefetch_related` & `only` arguments
+    needed to represent objects of model with serializer_class without
+    extra queries per object.
+
+    Forward relations are selected, to-many relations (and everything
+    under them) are prefetched. `only` is None if a field uses
+    something other than model fields, e.g. SerializerMethodField.
+
+    Parameters
+    ----------
+    serializer_class: Serializer class
+    model: Model class
+
+    Returns
+    -------
+    plan: dict
+    """
+    plan = {"select_related": set(), "prefetch_related": set(), "only": set()}
+    _plan_fields(serializer_class(), model, "", plan, False)
+
+    # A prefetch lookup covers every prefix of it
+    plan["prefetch_related"] = {
+        path
+        for path in plan["prefetch_related"]
+        if not any(p.startswith(path + "__") for p in plan["prefetch_related"])
+    }
+    if plan["only"] is not None:
+        plan["only"].add(model._meta.pk.name)
+    return plan
+
+
+def apply_query_plan(queryset, plan, only=True):
+    """
+    Applies plan of `get_query_plan` on queryset.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+    plan: dict
+    only: bool
+        Whether to defer columns not used by serializer. Shouldn't be
+        used for objects that will be saved, as deferred auto_now
+        fields are not updated.
+
+    Returns
+    -------
+    queryset: QuerySet
+    """
+    if plan["select_related"]:
+        queryset = queryset.select_related(*sorted(plan["select_related"]))
+    if plan["prefetch_related"]:
+        queryset = queryset.prefetch_related(*sorted(plan["prefetch_related"]))
+    if only and plan["only"] is not None:
+        queryset = queryset.only(*sorted(plan["only"]))
+    return queryset
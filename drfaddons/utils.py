@@ -4,22 +4,60 @@ Contains various utility functions that is commonly used.
 Author: Various different people from internet. Links included
         in Source.
 """
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import ipaddress
 import json
+import math
+import re
 import smtplib
+from datetime import date
 from datetime import datetime
 from datetime import time
+from decimal import Decimal
+from functools import lru_cache
+from itertools import groupby
+from itertools import islice
 from typing import List
+from uuid import UUID
 
 from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
 from django.core.exceptions import ValidationError
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail import get_connection
 from django.core.mail import send_mail
 from django.core.paginator import EmptyPage
 from django.core.paginator import PageNotAnInteger
 from django.core.paginator import Paginator
+from django.core.signals import setting_changed
+from django.core.validators import validate_email as django_validate_email
+from django.db import connections
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.utils.functional import Promise
 from sendsms import api
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
 
 class DateTimeEncoder(json.JSONEncoder):
     """Date Time Encoder for JSON. I do not use this anymore
@@ -47,7 +85,7 @@ class JsonResponse(HttpResponse):
 
     def __init__(self, content, status=None, content_type="application/json"):
         data = {"data": content, "status_code": status}
-        json_text = json.dumps(data, default=json_serial)
+        json_text = json_dumps(data)
         super(JsonResponse, self).__init__(
             content=json_text, status=status, content_type=content_type
         )
@@ -61,16 +99,188 @@ def json_serial(obj):
     https://github.com/chartmogul/chartmogul-python/blob/master/chartmogul/resource.py]
     """
 
-    if isinstance(obj, (datetime, time)):
+    if isinstance(obj, (datetime, date, time)):
         return obj.isoformat()
+    if isinstance(obj, (UUID, Decimal, Promise)):
+        # Promise covers lazy translation strings
+        return str(obj)
     return "Non-Serializable Data"
 
 
+def _json_dumps(data):
+    return json.dumps(data, default=json_serial)
+
+
+def _orjson_dumps(data):
+    # orjson encodes datetime, date, time & UUID natively and returns
+    # bytes, which HttpResponse accepts as is.
+    try:
+        return orjson.dumps(data, default=json_serial, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # e.g. integers beyond 64 bits, which stdlib json can encode
+        return _json_dumps(data)
+
+
+def _ujson_dumps(data):
+    try:
+        return ujson.dumps(data, default=json_serial)
+    except OverflowError:
+        # Integers beyond 64 bits, which stdlib json can encode
+        return _json_dumps(data)
+
+
+JSON_BACKENDS = {
+    "orjson": (orjson, _orjson_dumps),
+    "ujson": (ujson, _ujson_dumps),
+    "json": (json, _json_dumps),
+}
+
+
+def get_json_dumps():
+    """
+    Returns the JSON encoding function as per `DRFADDONS_JSON_BACKEND`
+    setting.
+
+    `auto` (default) picks the first importable of orjson, ujson and
+    stdlib json. `orjson`, `ujson` or `json` can be set to force a
+    backend. Data that orjson or ujson can't encode, e.g. integers
+    beyond 64 bits, is encoded with stdlib json.
+
+    Returns
+    -------
+    dumps: callable
+        Takes python data and returns encoded str or bytes.
+    """
+    backend = getattr(settings, "DRFADDONS_JSON_BACKEND", "auto")
+
+    if backend == "auto":
+        for module, dumps in JSON_BACKENDS.values():
+            if module is not None:
+                return dumps
+
+    if backend not in JSON_BACKENDS:
+        raise ImproperlyConfigured(
+            "DRFADDONS_JSON_BACKEND must be one of auto, {}.".format(
+                ", ".join(JSON_BACKENDS)
+            )
+        )
+
+    module, dumps = JSON_BACKENDS[backend]
+    if module is None:
+        raise ImproperlyConfigured(
+            "DRFADDONS_JSON_BACKEND is {} but it is not installed.".format(backend)
+        )
+    return dumps
+
+
+def json_dumps(data):
+    """
+    Encodes data into JSON with the configured backend. Along with
+    native JSON types, handles datetime, date, time, UUID, Decimal and
+    lazy translation strings.
+
+    Parameters
+    ----------
+    data: object
+
+    Returns
+    -------
+    json_text: str or bytes
+    """
+    return get_json_dumps()(data)
+
+
+def stream_paginate_data(
+    queryset: QuerySet, serializer, status=None, chunk_size: int = 2000
+):
+    """
+    Lazily encodes all objects of a queryset into the JSON envelope of
+    `JsonResponse` with the unpaginated data of `paginate_data`.
+    Objects are fetched via `iterator(chunk_size=...)` and serialized
+    & encoded one chunk at a time, so memory stays bounded by
+    chunk_size irrespective of the number of objects.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Ordered queryset that is to be streamed.
+    serializer: Serializer class
+        Serializer used to represent objects. It uses show_serializer.
+    status: int
+        HTTP Status Code, added as `status_code` in envelope.
+    chunk_size: int
+        Number of objects fetched, serialized and encoded at once.
+
+    Yields
+    ------
+    json_text: str or bytes
+    """
+    dumps = get_json_dumps()
+    objects = queryset.iterator(chunk_size=chunk_size)
+    total_objects = 0
+
+    yield '{"data":{"objects":['
+    while True:
+        chunk = list(islice(objects, chunk_size))
+        if not chunk:
+            break
+
+        if total_objects:
+            yield ","
+        # Strip list brackets from encoded chunk to join chunks in one
+        # list.
+        yield dumps(serializer(chunk, many=True).data)[1:-1]
+        total_objects += len(chunk)
+
+    yield "],"
+    yield dumps(
+        {
+            "previous": -1,
+            "next": -1,
+            "total_pages": 1,
+            "current": 1,
+            "total_objects": total_objects,
+        }
+    )[1:-1]
+    yield '},"status_code":'
+    yield dumps(status)
+    yield "}"
+
+
+class StreamingJsonResponse(StreamingHttpResponse):
+    """
+    A StreamingHttpResponse that streams all objects of a queryset in the
+    same JSON as JsonResponse does for unpaginated `paginate_data`.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        serializer,
+        status=None,
+        chunk_size=2000,
+        content_type="application/json",
+    ):
+        super(StreamingJsonResponse, self).__init__(
+            streaming_content=stream_paginate_data(
+                queryset=queryset,
+                serializer=serializer,
+                status=status,
+                chunk_size=chunk_size,
+            ),
+            status=status,
+            content_type=content_type,
+        )
+
+
 def get_client_ip(request):
     """
     Fetches the IP address of a client from Request and
     return in proper format.
     Source: https://stackoverflow.com/a/4581997
+    If `DRFADDONS_TRUSTED_PROXIES` setting is set, IP address is
+    resolved by `resolve_client_ip` instead of trusting the first
+    address of X-Forwarded-For header, which can be spoofed.
     Parameters
     ----------
     request: django.http.HttpRequest
@@ -79,6 +289,10 @@ def get_client_ip(request):
     -------
     ip: str
     """
+    if getattr(settings, "DRFADDONS_TRUSTED_PROXIES", None) is not None:
+        ip = resolve_client_ip(request)
+        return None if ip is None else str(ip)
+
     x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
     if x_forwarded_for:
         ip = x_forwarded_for.split(",")[0]
@@ -87,6 +301,149 @@ def get_client_ip(request):
     return ip
 
 
+class TrustedNetworks:
+    """
+    Set of IPv4 & IPv6 networks. Networks are grouped by prefix length,
+    so that matching an address costs one set lookup per distinct
+    prefix length, however many networks there are.
+
+    Parameters
+    ----------
+    networks: iterable
+        Networks in CIDR notation, e.g. "10.0.0.0/8", or addresses.
+    """
+
+    def __init__(self, networks):
+        prefixes = {4: {}, 6: {}}
+        for network in networks:
+            network = ipaddress.ip_network(network, strict=False)
+            prefixes[network.version].setdefault(network.prefixlen, set()).add(
+                int(network.network_address)
+            )
+
+        # version -> [(mask, network addresses)], most specific first
+        self._lookup = {}
+        for version, bits in ((4, 32), (6, 128)):
+            self._lookup[version] = [
+                (((1 << prefixlen) - 1) << (bits - prefixlen), addresses)
+                for prefixlen, addresses in sorted(
+                    prefixes[version].items(), reverse=True
+                )
+            ]
+
+    def __contains__(self, address):
+        value = int(address)
+        for mask, addresses in self._lookup[address.version]:
+            if value & mask in addresses:
+                return True
+        return False
+
+    def __bool__(self):
+        return any(self._lookup.values())
+
+
+@lru_cache(maxsize=1024)
+def parse_ip(value):
+    """
+    Parses an IP address, as found in REMOTE_ADDR or X-Forwarded-For
+    header, optionally with a port. IPv4 mapped IPv6 addresses are
+    returned as IPv4 addresses.
+
+    Parameters
+    ----------
+    value: str
+
+    Returns
+    -------
+    ip: IPv4Address or IPv6Address, None if value is invalid
+    """
+    value = value.strip()
+    if value.startswith("["):
+        # [IPv6]:port
+        value = value[1:].split("]")[0]
+    elif value.count(":") == 1:
+        # IPv4:port
+        value = value.split(":")[0]
+
+    try:
+        ip = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+
+    if ip.version == 6 and ip.ipv4_mapped:
+        return ip.ipv4_mapped
+    return ip
+
+
+_trusted_proxies = None
+
+
+def get_trusted_proxies():
+    """
+    Returns TrustedNetworks of `DRFADDONS_TRUSTED_PROXIES` setting,
+    built once and rebuilt after the setting changes.
+    """
+    global _trusted_proxies
+
+    if _trusted_proxies is None:
+        _trusted_proxies = TrustedNetworks(
+            getattr(settings, "DRFADDONS_TRUSTED_PROXIES", None) or ()
+        )
+    return _trusted_proxies
+
+
+def reset_trusted_proxies(setting, **kwargs):
+    global _trusted_proxies
+
+    if setting == "DRFADDONS_TRUSTED_PROXIES":
+        _trusted_proxies = None
+
+
+setting_changed.connect(
+    reset_trusted_proxies, dispatch_uid="drfaddons_reset_trusted_proxies"
+)
+
+
+def resolve_client_ip(request, trusted_proxies=None):
+    """
+    Resolves IP address of the client. If REMOTE_ADDR is a trusted
+    proxy, X-Forwarded-For header is walked from right to left and the
+    first address that isn't a trusted proxy is the client. The result
+    is stored on request, so header is parsed once per request.
+
+    Parameters
+    ----------
+    request: django.http.HttpRequest
+    trusted_proxies: TrustedNetworks
+        Defaults to `get_trusted_proxies()`, i.e. networks in
+        `DRFADDONS_TRUSTED_PROXIES` setting (default: none, header is
+        ignored).
+
+    Returns
+    -------
+    ip: IPv4Address or IPv6Address, None if REMOTE_ADDR is invalid
+    """
+    if trusted_proxies is None and hasattr(request, "_drfaddons_client_ip"):
+        return request._drfaddons_client_ip
+
+    networks = get_trusted_proxies() if trusted_proxies is None else trusted_proxies
+    ip = parse_ip(request.META.get("REMOTE_ADDR") or "")
+
+    if ip is not None and networks and ip in networks:
+        for value in reversed(request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")):
+            hop = parse_ip(value)
+            if hop is None:
+                # Untrusted garbage, last trusted proxy is all we know
+                break
+            ip = hop
+            if hop not in networks:
+                break
+
+    if trusted_proxies is None:
+        request._drfaddons_client_ip = ip
+    return ip
+
+
 def validate_email(email):
     """
     Validates an email address
@@ -99,15 +456,17 @@ def validate_email(email):
     -------
     bool
     """
-    from django.core.validators import validate_email
-
     try:
-        validate_email(email)
+        django_validate_email(email)
         return True
     except ValidationError:
         return False
 
 
+# A mobile number, with country code or not, after removing blanks
+MOBILE_RE = re.compile(r"\+?\d{10,15}")
+
+
 def get_mobile_number(mobile):
     """
     Returns a mobile number after removing blanks
@@ -145,6 +504,65 @@ def validate_mobile(mobile):
     return len(mobile) == 10
 
 
+@lru_cache(maxsize=4096)
+def classify_recipient(recipient):
+    """
+    Classifies a recipient as an email or a mobile number, the way
+    `send_message` does. Results are memoized in a bounded LRU cache.
+
+    Parameters
+    ----------
+    recipient: str
+
+    Returns
+    -------
+    is_email: bool
+    recipient: str
+        Recipient, blanks removed if it is a mobile number.
+    """
+    # Strings without @ are never valid emails, skip the validator
+    if "@" in recipient and validate_email(recipient):
+        return True, recipient
+    return False, get_mobile_number(recipient)
+
+
+def normalize_recipients(recipients) -> dict:
+    """
+    Classifies and normalizes a whole list of recipients in a single
+    pass, e.g. for bulk notifications. Duplicates (after normalization)
+    are dropped and invalid recipients are reported instead of raising.
+
+    Parameters
+    ----------
+    recipients: iterable
+        Emails and/or mobile numbers.
+
+    Returns
+    -------
+    recipients: dict
+        `emails` & `mobiles` are lists of normalized, valid
+        recipients, in order of appearance. `invalid` lists
+        recipients that are neither a valid email nor a mobile number
+        of 10 to 15 digits, with an optional leading +.
+    """
+    emails, mobiles, invalid = [], [], []
+    seen = set()
+
+    for recipient in recipients:
+        if not isinstance(recipient, str):
+            invalid.append(recipient)
+            continue
+
+        is_email, value = classify_recipient(recipient)
+        if not is_email and not MOBILE_RE.fullmatch(value):
+            invalid.append(recipient)
+        elif value not in seen:
+            seen.add(value)
+            (emails if is_email else mobiles).append(value)
+
+    return {"emails": emails, "mobiles": mobiles, "invalid": invalid}
+
+
 def paginate_data(searched_data, request_data):
     """
     Paginates the searched_data as per the request_data
@@ -192,32 +610,386 @@ def paginate_data(searched_data, request_data):
     return data
 
 
-def send_message(
-    message: str, subject: str, recip: list, recip_email: list, html_message: str = None
-):
+def estimate_count(queryset: QuerySet):
     """
-    Sends message to specified value.
-    Source: Himanshu Shankar (https://github.com/iamhssingh)
+    Returns the query planner's row estimate for a queryset without
+    running it. Only PostgreSQL exposes a usable estimate.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+
+    Returns
+    -------
+    count: int or None
+        None if database does not provide an estimate.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_queryset(queryset: QuerySet, strategy: str = "exact") -> int:
+    """
+    Counts objects in a queryset as per the strategy.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+    strategy: str
+        exact: Runs a single `COUNT(*)` query.
+        estimate: Uses planner's estimate, if database provides one and
+            it is above `DRFADDONS_COUNT_ESTIMATE_THRESHOLD` (default:
+            10000). Smaller results are counted exactly.
+        cached: Caches exact count in Django's cache for
+            `DRFADDONS_COUNT_CACHE_TIMEOUT` seconds (default: 60).
+
+    Returns
+    -------
+    count: int
+    """
+    if strategy == "exact":
+        return queryset.count()
+
+    if strategy == "estimate":
+        estimate = estimate_count(queryset)
+        threshold = getattr(settings, "DRFADDONS_COUNT_ESTIMATE_THRESHOLD", 10000)
+        if estimate is None or estimate < threshold:
+            return queryset.count()
+        return estimate
+
+    if strategy == "cached":
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.sha256("{}{}{}".format(queryset.db, sql, params).encode())
+        key = "drfaddons:count:{}".format(digest.hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(
+                key, count, getattr(settings, "DRFADDONS_COUNT_CACHE_TIMEOUT", 60)
+            )
+        return count
+
+    raise ValueError("Invalid count strategy: {}".format(strategy))
+
+
+class QuerySetPaginator(Paginator):
+    """
+    A Paginator that counts its queryset as per the count strategy.
+    Only the sliced page is fetched from the database.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy="exact", **kwargs):
+        self.count_strategy = count_strategy
+        super(QuerySetPaginator, self).__init__(object_list, per_page, **kwargs)
+
+    @cached_property
+    def count(self):
+        return count_queryset(queryset=self.object_list, strategy=self.count_strategy)
+
+
+def queryset_paginate_data(
+    queryset: QuerySet, serializer, request_data, count: str = "exact"
+) -> dict:
+    """
+    Paginates a queryset as per the request_data. Works same as
+    `paginate_data`, except that the queryset is sliced in database and
+    only current page is serialized.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Un-ordered queryset that is to be paginated.
+    serializer: Serializer class
+        Serializer used to represent objects of current page. It uses
+        show_serializer.
+    request_data: Serializer.data
+        It is the request data. It uses serializer_class.
+    count: str
+        Count strategy, see `count_queryset`.
+
+    Returns
+    -------
+    data: dict
+    """
+    # Primary key breaks ties, so that pages don't overlap
+    order_by = request_data.data["order_by"][0]
+    queryset = queryset.order_by(order_by, "-pk" if order_by.startswith("-") else "pk")
+
+    if int(request_data.data["paginator"]) < 1:
+        return paginate_data(
+            searched_data=serializer(queryset, many=True), request_data=request_data
+        )
+
+    paginator = QuerySetPaginator(
+        queryset, request_data.data["paginator"], count_strategy=count
+    )
+    try:
+        curr = paginator.page(request_data.data["page"])
+    except PageNotAnInteger:
+        curr = paginator.page(1)
+    except EmptyPage:
+        curr = paginator.page(paginator.num_pages)
+
+    data = {
+        "total_pages": paginator.num_pages,
+        "current": curr.number,
+        "total_objects": paginator.count,
+        "next": curr.next_page_number() if curr.has_next() else -1,
+    }
+
+    data["previous"] = curr.previous_page_number() if curr.number > 1 else -1
+    data["objects"] = serializer(curr.object_list, many=True).data
+    return data
+
+
+KEYSET_ANNOTATION = "drfaddons_keyset_value"
+CURSOR_SALT = "drfaddons.utils.cursor"
+
+
+def encode_cursor(
+    value, pk, page: int, reverse: bool = False, order_by: str = None
+) -> str:
+    """
+    Encodes a keyset position into an opaque, URL safe and signed
+    cursor string.
+
+    Parameters
+    ----------
+    value: object
+        Value of the ordering key of the boundary object.
+    pk: object
+        Primary key of the boundary object, used as a tie breaker.
+    page: int
+        Page number that the cursor points to.
+    reverse: bool
+        Whether the cursor walks backwards, i.e. to a previous page.
+    order_by: str
+        Ordering the cursor was created for, if any.
+
+    Returns
+    -------
+    cursor: str
+    """
+    position = {"v": value, "pk": pk, "p": page, "r": reverse, "o": order_by}
+    # str() keeps full precision of datetime, Decimal & UUID values,
+    # and Django's field lookups can parse it back.
+    raw = json.dumps(position, default=str, separators=(",", ":"))
+    return signing.Signer(salt=CURSOR_SALT).sign(
+        base64.urlsafe_b64encode(raw.encode()).decode()
+    )
+
+
+def decode_cursor(cursor: str, order_by: str = None):
+    """
+    Decodes a cursor created by `encode_cursor`.
+
+    Parameters
+    ----------
+    cursor: str
+    order_by: str
+        If given, cursors created for another ordering are rejected.
+
+    Returns
+    -------
+    position: dict or None
+        None if cursor is empty, has been tampered with or doesn't
+        match order_by.
+    """
+    if not cursor:
+        return None
+
+    try:
+        raw = signing.Signer(salt=CURSOR_SALT).unsign(str(cursor))
+        position = json.loads(base64.urlsafe_b64decode(raw.encode()))
+    except (signing.BadSignature, binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    if not isinstance(position, dict) or not {"v", "pk", "p", "r"} <= set(position):
+        return None
+    if (
+        type(position["p"]) is not int
+        or position["p"] < 1
+        or not isinstance(position["r"], bool)
+    ):
+        return None
+    if order_by is not None and position.get("o") != order_by:
+        return None
+    return position
+
+
+def _keyset_filter(position: dict, ascending: bool) -> Q:
+    """
+    Builds the filter of objects beyond a keyset position, where NULL
+    keys sort after every other key.
+
+    Parameters
+    ----------
+    position: dict
+        Position decoded by `decode_cursor`.
+    ascending: bool
+        Whether objects are walked in ascending order.
+
+    Returns
+    -------
+    q: Q
+    """
+    lookup = "gt" if ascending else "lt"
+    value, pk = position["v"], position["pk"]
+    is_null = Q(**{KEYSET_ANNOTATION + "__isnull": True})
+
+    if value is None:
+        same_key = is_null & Q(**{"pk__" + lookup: pk})
+        return same_key if ascending else same_key | ~is_null
+
+    beyond = Q(**{KEYSET_ANNOTATION + "__" + lookup: value}) | Q(
+        **{KEYSET_ANNOTATION: value, "pk__" + lookup: pk}
+    )
+    return beyond | is_null if ascending else beyond
+
+
+def keyset_paginate_data(
+    queryset: QuerySet, serializer, request_data, count: str = None
+) -> dict:
+    """
+    Paginates a queryset with keyset (cursor) pagination, as per the
+    request_data.
+    Unlike `paginate_data`, only the requested page is fetched from the
+    database and serialized, using
+    `WHERE (order_key, pk) > cursor ORDER BY order_key, pk LIMIT n`.
+    Objects with a NULL ordering key come after others in ascending
+    order, before others in descending order.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        Un-ordered queryset that is to be paginated.
+    serializer: Serializer class
+        Serializer used to represent objects of current page. It uses
+        show_serializer.
+    request_data: Serializer.data
+        It is the request data. It uses serializer_class.
+        `order_by[0]` is used as ordering key and the optional `cursor`
+        key is used as position.
+    count: str
+        Count strategy for `total_objects` and `total_pages`, see
+        `count_queryset`. These are set to -1 if not provided.
+
+    Returns
+    -------
+    data: dict
+        Same as `paginate_data` along with `next_cursor` and
+        `previous_cursor`.
+    """
+    page_size = int(request_data.data["paginator"])
+    order_by = request_data.data["order_by"][0]
+
+    if page_size < 1:
+        return paginate_data(
+            searched_data=serializer(queryset.order_by(order_by), many=True),
+            request_data=request_data,
+        )
+
+    descending = order_by.startswith("-")
+    position = decode_cursor(request_data.data.get("cursor"), order_by=order_by)
+    reverse = bool(position and position["r"])
+
+    keyset = queryset.annotate(**{KEYSET_ANNOTATION: F(order_by.lstrip("-"))})
+    if position:
+        try:
+            keyset = keyset.filter(_keyset_filter(position, descending is reverse))
+        except (TypeError, ValueError, ValidationError):
+            # Value doesn't fit the field, start over from first page
+            position, reverse = None, False
+
+    # Ascending walk when order is ascending and we move forward, or
+    # order is descending and we move backward. NULL keys sort last in
+    # ascending order, same as on PostgreSQL.
+    if descending is reverse:
+        ordering = (F(KEYSET_ANNOTATION).asc(nulls_last=True), "pk")
+    else:
+        ordering = (F(KEYSET_ANNOTATION).desc(nulls_first=True), "-pk")
+
+    # Fetch one extra object to know if there is anything beyond.
+    objects = list(keyset.order_by(*ordering)[: page_size + 1])
+    has_more = len(objects) > page_size
+    objects = objects[:page_size]
+
+    if reverse:
+        objects.reverse()
+        current = position["p"] if has_more else 1
+        has_next, has_previous = True, has_more
+    else:
+        current = position["p"] if position else 1
+        has_next, has_previous = has_more, current > 1
+
+    data = {"total_pages": -1, "total_objects": -1}
+    if count:
+        data["total_objects"] = count_queryset(queryset=queryset, strategy=count)
+        data["total_pages"] = max(math.ceil(data["total_objects"] / page_size), 1)
+
+    data["current"] = current
+    data["next"] = current + 1 if has_next and objects else -1
+    data["previous"] = current - 1 if has_previous and objects else -1
+    data["next_cursor"] = (
+        encode_cursor(
+            value=getattr(objects[-1], KEYSET_ANNOTATION),
+            pk=objects[-1].pk,
+            page=current + 1,
+            order_by=order_by,
+        )
+        if data["next"] > 0
+        else None
+    )
+    data["previous_cursor"] = (
+        encode_cursor(
+            value=getattr(objects[0], KEYSET_ANNOTATION),
+            pk=objects[0].pk,
+            page=current - 1,
+            reverse=True,
+            order_by=order_by,
+        )
+        if data["previous"] > 0
+        else None
+    )
+    data["objects"] = serializer(objects, many=True).data
+    return data
+
+
+def clean_message_recipients(recip: list, recip_email: list):
+    """
+    Validates settings and recipients of a message, as needed by
+    `send_message` & `asend_message`. Mobile numbers in recip are
+    normalized in place.
+
     Parameters
     ----------
-    message: str
-        Message that is to be sent to user.
-    subject: str
-        Subject that is to be sent to user, in case prop is an email.
     recip: list
-        Recipient to whom message is being sent.
+        Recipients, either all emails or all mobile numbers.
     recip_email: list
-        Recipient to whom EMail is being sent. This will be deprecated once
-        SMS feature is brought in.
-    html_message: str
-        HTML variant of message, if any.
+        Fallback email recipients.
 
     Returns
     -------
-    sent: dict
-    """
-    sent = {"success": False, "message": None}
+    is_email: bool
+        Whether recip are emails.
+    recip: list
+    recip_email: list
 
+    Raises
+    ------
+    ValueError
+        If email isn't configured or any recipient is invalid.
+    """
     if not getattr(settings, "EMAIL_HOST", None):
         raise ValueError(
             "EMAIL_HOST must be defined in django " "setting for sending mail."
@@ -236,16 +1008,17 @@ def send_message(
         raise ValueError("Invalid recipient.")
 
     # Check if all recipient in list are of same type
-    is_email = validate_email(recip[0])
+    is_email = classify_recipient(recip[0])[0]
     for ind in range(len(recip)):
-        if validate_email(recip[ind]) is not is_email:
+        rcp_is_email, rcp = classify_recipient(recip[ind])
+        if rcp_is_email is not is_email:
             raise ValueError("All recipient should be of same type.")
         elif not is_email:
-            recip[ind] = get_mobile_number(recip[ind])
+            recip[ind] = rcp
 
     # Check if fallback email is indeed an email
     for rcp in recip_email:
-        if not validate_email(rcp):
+        if not classify_recipient(rcp)[0]:
             raise ValueError("Invalid email provided: {}".format(rcp))
 
     if isinstance(recip, str):
@@ -255,6 +1028,69 @@ def send_message(
         # For backsupport
         recip_email = [recip_email]
 
+    return is_email, recip, recip_email
+
+
+def send_message(
+    message: str,
+    subject: str,
+    recip: list,
+    recip_email: list,
+    html_message: str = None,
+    queued: bool = None,
+    connection=None,
+):
+    """
+    Sends message to specified value.
+    Source: Himanshu Shankar (https://github.com/iamhssingh)
+    Parameters
+    ----------
+    message: str
+        Message that is to be sent to user.
+    subject: str
+        Subject that is to be sent to user, in case prop is an email.
+    recip: list
+        Recipient to whom message is being sent.
+    recip_email: list
+        Recipient to whom EMail is being sent. This will be deprecated once
+        SMS feature is brought in.
+    html_message: str
+        HTML variant of message, if any.
+    queued: bool
+        If True, message is validated and handed over to
+        `delivery.get_message_queue()` instead of being sent in the
+        current thread. Defaults to `DRFADDONS_QUEUE_MESSAGES` setting
+        (default: False).
+    connection: EmailBackend
+        Mail connection to send email over, if any.
+
+    Returns
+    -------
+    sent: dict
+        When queued, `result` key holds a Future that resolves to the
+        dict that would have been returned otherwise.
+    """
+    sent = {"success": False, "message": None}
+
+    is_email, recip, recip_email = clean_message_recipients(recip, recip_email)
+
+    if queued is None:
+        queued = getattr(settings, "DRFADDONS_QUEUE_MESSAGES", False)
+
+    if queued:
+        from .delivery import get_message_queue
+
+        sent["result"] = get_message_queue().put(
+            message=message,
+            subject=subject,
+            recip=recip,
+            recip_email=recip_email,
+            html_message=html_message,
+        )
+        sent["message"] = "Message queued successfully!"
+        sent["success"] = True
+        return sent
+
     if is_email:
         try:
             send_mail(
@@ -263,6 +1099,7 @@ def send_message(
                 html_message=html_message,
                 from_email=settings.EMAIL_FROM,
                 recipient_list=recip,
+                connection=connection,
             )
         except smtplib.SMTPException as ex:
             sent["message"] = "Message sending failed!" + str(ex.args)
@@ -283,6 +1120,8 @@ def send_message(
                 recip=recip_email,
                 recip_email=recip_email,
                 html_message=html_message,
+                queued=False,
+                connection=connection,
             )
         except Exception as ex:
             sent["message"] = "Message sending Failed!" + str(ex.args)
@@ -293,6 +1132,8 @@ def send_message(
                 recip=recip_email,
                 recip_email=recip_email,
                 html_message=html_message,
+                queued=False,
+                connection=connection,
             )
         else:
             sent["message"] = "Message sent successfully!"
@@ -301,6 +1142,188 @@ def send_message(
     return sent
 
 
+async def asend_message(
+    message: str,
+    subject: str,
+    recip: list,
+    recip_email: list,
+    html_message: str = None,
+    sms_timeout: float = None,
+    email_timeout: float = None,
+) -> dict:
+    """
+    Async version of `send_message`. SMS and the fallback email are
+    sent concurrently, each in a thread and within its own timeout, so
+    that latency is that of the slower channel and the event loop is
+    never blocked. A channel that times out keeps running in its
+    thread, but its result is ignored.
+
+    Parameters
+    ----------
+    message: str
+    subject: str
+    recip: list
+    recip_email: list
+    html_message: str
+        Same as `send_message`.
+    sms_timeout: float
+        Seconds to wait for SMS. Defaults to `DRFADDONS_SMS_TIMEOUT`
+        setting (default: 10).
+    email_timeout: float
+        Seconds to wait for email. Defaults to `DRFADDONS_EMAIL_TIMEOUT`
+        setting (default: 10).
+
+    Returns
+    -------
+    sent: dict
+        `success` & `message` of the primary channel (SMS for mobile
+        numbers, email otherwise), same as `send_message`, and
+        `channels` mapping every channel used to its own `success` &
+        `message`.
+    """
+    # asgiref ships with Django 3.0+ only
+    from asgiref.sync import sync_to_async
+
+    is_email, recip, recip_email = clean_message_recipients(recip, recip_email)
+
+    if sms_timeout is None:
+        sms_timeout = getattr(settings, "DRFADDONS_SMS_TIMEOUT", 10)
+    if email_timeout is None:
+        email_timeout = getattr(settings, "DRFADDONS_EMAIL_TIMEOUT", 10)
+
+    def send_email(recipients):
+        return send_message(
+            message=message,
+            subject=subject,
+            recip=recipients,
+            recip_email=[],
+            html_message=html_message,
+            queued=False,
+        )
+
+    def send_sms():
+        api.send_sms(body=message, to=recip, from_phone=None)
+        return {"success": True, "message": "Message sent successfully!"}
+
+    async def run(func, timeout, *args):
+        try:
+            return await asyncio.wait_for(
+                sync_to_async(func, thread_sensitive=False)(*args), timeout
+            )
+        except asyncio.TimeoutError:
+            return {"success": False, "message": "Message sending timed out!"}
+        except Exception as ex:
+            return {
+                "success": False,
+                "message": "Message sending Failed!" + str(ex.args),
+            }
+
+    channels = {}
+    if is_email:
+        channels["email"] = run(send_email, email_timeout, recip)
+    else:
+        channels["sms"] = run(send_sms, sms_timeout)
+        if recip_email:
+            channels["email"] = run(send_email, email_timeout, recip_email)
+
+    results = dict(zip(channels, await asyncio.gather(*channels.values())))
+    primary = results["email" if is_email else "sms"]
+    return {
+        "success": primary["success"],
+        "message": primary["message"],
+        "channels": results,
+    }
+
+
+def send_messages(batch: List[dict], connection=None) -> List[dict]:
+    """
+    Sends many emails over a single mail connection, one email per
+    item, so that recipients of an item never see those of another.
+
+    Parameters
+    ----------
+    batch: List[dict]
+        Every item has `message`, `subject`, `recip` (list of emails)
+        and optionally `html_message`, same as `send_message`.
+    connection: EmailBackend
+        Mail connection to send emails over. A new connection from
+        `get_connection()` is used otherwise.
+
+    Returns
+    -------
+    sent: List[dict]
+        One dict per item of batch, with `success` & `message` same as
+        `send_message` and `recipients` mapping every recipient to
+        whether email was sent to it. Invalid emails are reported here
+        instead of raising.
+    """
+    if not getattr(settings, "EMAIL_FROM", None):
+        raise ValueError(
+            "EMAIL_FROM must be defined in django setting "
+            "for sending mail. Who is sending email?"
+        )
+
+    sent = [{"success": False, "message": None, "recipients": {}} for _ in batch]
+
+    # Valid, unique recipients of every item, in order
+    valid = []
+    for index, item in enumerate(batch):
+        recip = item["recip"]
+        if isinstance(recip, str):
+            # For backsupport
+            recip = [recip]
+
+        recipients = {}
+        for rcp in recip:
+            sent[index]["recipients"][rcp] = False
+            if classify_recipient(rcp)[0]:
+                recipients[rcp] = None
+            else:
+                sent[index]["message"] = "Invalid email provided: {}".format(rcp)
+        valid.append(list(recipients))
+
+    connection = connection or get_connection()
+    try:
+        new_connection = connection.open()
+    except (smtplib.SMTPException, OSError) as ex:
+        for result in sent:
+            result["message"] = "Message sending failed!" + str(ex.args)
+        return sent
+
+    try:
+        for item, recipients, result in zip(batch, valid, sent):
+            if not recipients:
+                continue
+
+            email = EmailMultiAlternatives(
+                subject=item["subject"],
+                body=item["message"],
+                from_email=settings.EMAIL_FROM,
+                to=recipients,
+                connection=connection,
+            )
+            if item.get("html_message"):
+                email.attach_alternative(item["html_message"], "text/html")
+
+            try:
+                success = bool(connection.send_messages([email]))
+                status = "Message sent successfully!"
+            except smtplib.SMTPException as ex:
+                success = False
+                status = "Message sending failed!" + str(ex.args)
+
+            for rcp in recipients:
+                result["recipients"][rcp] = success
+            if result["message"] is None or not success:
+                result["message"] = status
+            result["success"] = all(result["recipients"].values())
+    finally:
+        if new_connection:
+            connection.close()
+
+    return sent
+
+
 def groupby_queryset_with_fields(queryset: QuerySet, fields: List) -> dict:
     """Segregates a queryset according to given fields in a list
 
@@ -320,7 +1343,6 @@ def groupby_queryset_with_fields(queryset: QuerySet, fields: List) -> dict:
     https://www.neerajbyte.com/snippet/groupby-django-queryset-data-according-to-fields-n/
     """
     fields_qs = {}
-    from itertools import groupby
 
     for field in fields:
         queryset = queryset.order_by(field)
@@ -342,3 +1364,103 @@ def groupby_queryset_with_fields(queryset: QuerySet, fields: List) -> dict:
             )
         ]
     return fields_qs
+
+
+def group_queryset_by_fields(
+    queryset: QuerySet, fields: List, items: bool = True
+) -> dict:
+    """Segregates a queryset according to given fields in a list, in a
+    single query.
+    Unlike `groupby_queryset_with_fields`, related paths such as
+    `created_by__username` are resolved by the database, so there is
+    no extra query per object.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        The Queryset which is to be segregated
+    fields : List
+        List of fields name according to queryset will be segregated
+    items : bool
+        If False, objects are not fetched. Only the count of every
+        group is computed with one `GROUP BY` query per field.
+
+    Returns
+    -------
+    fields_qs: dict
+        Every field maps to a list of groups ordered by key, None last.
+        A group is `{"key": value, "items": [objects]}` or
+        `{"key": value, "count": int}` when items is False.
+    """
+    if not items:
+        fields_qs = {}
+        for field in fields:
+            groups = (
+                queryset.order_by()
+                .values(field)
+                .annotate(drfaddons_group_count=Count("pk"))
+            )
+            fields_qs[field] = sorted(
+                (
+                    {"key": group[field], "count": group["drfaddons_group_count"]}
+                    for group in groups
+                ),
+                key=lambda group: (group["key"] is None, group["key"]),
+            )
+        return fields_qs
+
+    aliases = {
+        "drfaddons_group_{}".format(index): field for index, field in enumerate(fields)
+    }
+    groups = {field: {} for field in fields}
+
+    for obj in queryset.annotate(**{a: F(f) for a, f in aliases.items()}):
+        for alias, field in aliases.items():
+            groups[field].setdefault(getattr(obj, alias), []).append(obj)
+
+    return {
+        field: [
+            {"key": key, "items": groups[field][key]}
+            for key in sorted(groups[field], key=lambda key: (key is None, key))
+        ]
+        for field in fields
+    }
+
+
+def iter_queryset_groups(queryset: QuerySet, fields: List, chunk_size: int = 2000):
+    """Lazily segregates a queryset according to given fields in a list.
+    Objects are streamed with `iterator(chunk_size=...)`, i.e. via
+    server-side cursors where database supports them, so only one chunk
+    of objects is held in memory at a time.
+
+    Like `itertools.groupby`, every group's items must be consumed
+    before advancing to next group; skipped items are not returned
+    later.
+
+    Parameters
+    ----------
+    queryset : QuerySet
+        The Queryset which is to be segregated
+    fields : List
+        List of fields name according to queryset will be segregated
+    chunk_size : int
+        Number of objects fetched from database at once.
+
+    Yields
+    ------
+    field: str
+    key: object
+        Value of field that is shared by items of this group.
+    items: iterator
+        Iterator over objects of this group.
+    """
+    alias = "drfaddons_group_key"
+
+    for field in fields:
+        objects = (
+            queryset.annotate(**{alias: F(field)})
+            .order_by(alias, "pk")
+            .iterator(chunk_size=chunk_size)
+        )
+        for key, items in groupby(objects, lambda obj: getattr(obj, alias)):
+            yield field, key, items
@@ -46,7 +46,9 @@ class ValidateAndPerformView(APIView):
         -------
         data: dict
             This contains relevant information that will be returned
-            after the operation has been performed
+            after the operation has been performed. A ready
+            HttpResponse, e.g. StreamingJsonResponse, is returned as
+            it is.
         status_code: int
             This will reflect the status code of the operation that has
             been performed.
@@ -59,9 +61,13 @@ class ValidateAndPerformView(APIView):
         from .utils import JsonResponse
         from rest_framework import status
 
+        from django.http.response import HttpResponseBase
+
         serialized_data = self.serializer_class(data=request.data)
         if serialized_data.is_valid():
             data, status_code = self.validated(serialized_data=serialized_data)
+            if isinstance(data, HttpResponseBase):
+                return data
             return JsonResponse(data, status=status_code)
 
         return JsonResponse(
@@ -136,13 +142,64 @@ class PaginatedSearchView(ValidateAndPerformView):
 
     permission_classes = (IsAuthenticated,)
 
+    # "page": serializes whole queryset and paginates in memory.
+    # "queryset": slices queryset in database & serializes only the
+    #             requested page.
+    # "keyset": fetches & serializes only the requested page using the
+    #           `cursor` key of serializer_class.
+    pagination_mode = "page"
+    # Count strategy, see utils.count_queryset. Keyset pagination does
+    # not count if it is None, "queryset" pagination counts exactly.
+    count_strategy = None
+    # Streams results in chunks of this size when paginator is 0,
+    # instead of encoding them at once.
+    stream_chunk_size = None
+
     def fetch_data(self, serialized_data):
         raise NotImplementedError("Implement Fetch Data")
 
     def validated(self, serialized_data, *args, **kwargs):
+        from .utils import keyset_paginate_data
         from .utils import paginate_data
+        from .utils import queryset_paginate_data
+        from .utils import StreamingJsonResponse
         from rest_framework import status
 
+        if self.stream_chunk_size and int(serialized_data.data["paginator"]) < 1:
+            return (
+                StreamingJsonResponse(
+                    queryset=self.fetch_data(serialized_data).order_by(
+                        serialized_data.data["order_by"][0]
+                    ),
+                    serializer=self.show_serializer,
+                    status=status.HTTP_202_ACCEPTED,
+                    chunk_size=self.stream_chunk_size,
+                ),
+                status.HTTP_202_ACCEPTED,
+            )
+
+        if self.pagination_mode == "keyset":
+            return (
+                keyset_paginate_data(
+                    queryset=self.fetch_data(serialized_data),
+                    serializer=self.show_serializer,
+                    request_data=serialized_data,
+                    count=self.count_strategy,
+                ),
+                status.HTTP_202_ACCEPTED,
+            )
+
+        if self.pagination_mode == "queryset":
+            return (
+                queryset_paginate_data(
+                    queryset=self.fetch_data(serialized_data),
+                    serializer=self.show_serializer,
+                    request_data=serialized_data,
+                    count=self.count_strategy or "exact",
+                ),
+                status.HTTP_202_ACCEPTED,
+            )
+
         searched_data = self.show_serializer(
             self.fetch_data(serialized_data).order_by(
                 serialized_data.data["order_by"][0]
@@ -0,0 +1,61 @@
+import smtplib
+import time
+
+from django.core.mail.backends.locmem import EmailBackend
+from sendsms.backends.locmem import SmsBackend
+
+
+class FlakyEmailBackend(EmailBackend):
+    """Fails every first attempt of a message."""
+
+    failed = set()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if message.subject not in self.failed:
+                self.failed.add(message.subject)
+                raise smtplib.SMTPException("Try again")
+        return super(FlakyEmailBackend, self).send_messages(messages)
+
+
+class CountingEmailBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return True
+
+
+class SlowSmsBackend(SmsBackend):
+    """Takes `delay` seconds to send messages."""
+
+    delay = 0.5
+
+    def send_messages(self, messages):
+        time.sleep(self.delay)
+        return super(SlowSmsBackend, self).send_messages(messages)
+
+
+class SlowEmailBackend(EmailBackend):
+    delay = 0.2
+
+    def send_messages(self, messages):
+        time.sleep(self.delay)
+        return super(SlowEmailBackend, self).send_messages(messages)
+
+
+class FailingSmsBackend(SmsBackend):
+    """Fails every SMS, counting attempts."""
+
+    attempts = 0
+
+    def send_messages(self, messages):
+        FailingSmsBackend.attempts += 1
+        raise OSError("SMS gateway down")
+
+
+class FailingCloseEmailBackend(EmailBackend):
+    """Sends messages but fails to close the connection."""
+
+    def close(self):
+        raise smtplib.SMTPServerDisconnected("Connection lost")
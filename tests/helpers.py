@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+from tests.models import Note
+
+
+class NoteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Note
+        fields = ("id", "title", "priority")
+
+
+class SearchSerializer(serializers.Serializer):
+    paginator = serializers.IntegerField()
+    page = serializers.IntegerField(default=1)
+    order_by = serializers.ListField(child=serializers.CharField())
+    cursor = serializers.CharField(required=False, allow_null=True)
+
+
+class StaffCheck:
+    """Privileged user check that counts its calls"""
+
+    calls = 0
+
+    def __call__(self, user):
+        StaffCheck.calls += 1
+        return user.is_staff
+
+
+is_staff = StaffCheck()
@@ -0,0 +1,31 @@
+from django.db import models
+
+from drfaddons.models import CreateUpdateModel
+from drfaddons.models import owner_indexes
+
+
+class Note(CreateUpdateModel):
+    title = models.CharField(max_length=100)
+    priority = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = owner_indexes()
+
+
+class Profile(CreateUpdateModel):
+    from django.contrib.auth import get_user_model
+
+    created_by = models.OneToOneField(get_user_model(), on_delete=models.PROTECT)
+    bio = models.CharField(max_length=100, blank=True)
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.name
+
+
+class Document(CreateUpdateModel):
+    title = models.CharField(max_length=100)
+    tags = models.ManyToManyField(Tag, blank=True)
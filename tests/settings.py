@@ -3,6 +3,15 @@ With these settings, tests run faster.
 """
 import os
 
+from django.utils import encoding
+from django.utils import translation
+
+# djangorestframework-jwt 1.11 imports helpers removed in Django 4.0
+if not hasattr(encoding, "smart_text"):
+    encoding.smart_text = encoding.smart_str
+if not hasattr(translation, "ugettext"):
+    translation.ugettext = translation.gettext
+
 TEST_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "tests")
 
 INSTALLED_APPS = (
@@ -0,0 +1,172 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test import override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from drfaddons.auth import JSONWebTokenAuthenticationQS
+from drfaddons.auth import get_jwt_auth_config
+from drfaddons.cache import get_jwt_cache
+
+
+def make_token(user):
+    from rest_framework_jwt.settings import api_settings
+
+    payload = api_settings.JWT_PAYLOAD_HANDLER(user)
+    return api_settings.JWT_ENCODE_HANDLER(payload)
+
+
+class TestJSONWebTokenAuthenticationQS(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.token = make_token(cls.user)
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION="JWT {}".format(token)
+        )
+        return JSONWebTokenAuthenticationQS().authenticate(request)
+
+    def test_authenticate(self):
+        with self.assertNumQueries(1):
+            user, token = self.authenticate(self.token)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token, self.token.encode())
+
+    def test_invalid_token(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.token + "x")
+
+    def test_get_jwt_value(self):
+        auth = JSONWebTokenAuthenticationQS()
+        cases = {
+            "JWT token": b"token",
+            "jwt \t token ": b"token",
+            "Bearer token": None,
+            "": None,
+        }
+        for header, value in cases.items():
+            with self.subTest(header=header):
+                request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=header)
+                self.assertEqual(auth.get_jwt_value(request), value)
+
+        for header in ("JWT", "JWT token other"):
+            with self.subTest(header=header):
+                request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=header)
+                with self.assertRaises(AuthenticationFailed):
+                    auth.get_jwt_value(request)
+
+    def test_prefix_overridden_by_subclass(self):
+        class Auth(JSONWebTokenAuthenticationQS):
+            prefix = "Bearer"
+
+        cases = {"Bearer token": b"token", "bearer token": b"token", "JWT token": None}
+        for header, value in cases.items():
+            with self.subTest(header=header):
+                request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=header)
+                self.assertEqual(Auth().get_jwt_value(request), value)
+
+    def test_get_jwt_value_without_prefix(self):
+        class Auth(JSONWebTokenAuthenticationQS):
+            header_key = "HTTP_X_TOKEN"
+            prefix = ""
+            cookie = "token"
+
+        request = APIRequestFactory().get("/", HTTP_X_TOKEN=" token ")
+        self.assertEqual(Auth().get_jwt_value(request), b"token")
+
+        request = APIRequestFactory().get("/", HTTP_X_TOKEN="JWT token")
+        with self.assertRaises(AuthenticationFailed):
+            Auth().get_jwt_value(request)
+
+        request = APIRequestFactory().get("/")
+        request.COOKIES["token"] = "cookie"
+        self.assertEqual(Auth().get_jwt_value(request), "cookie")
+
+    def test_config_follows_settings(self):
+        config = get_jwt_auth_config()
+        self.assertIs(get_jwt_auth_config(), config)
+        self.assertEqual(config.header_key, "HTTP_AUTHORIZATION")
+
+        with override_settings(
+            JWT_AUTH_KEY="X-Token",
+            JWT_AUTH={"JWT_AUTH_HEADER_PREFIX": "Bearer", "JWT_AUTH_COOKIE": "jwt"},
+        ):
+            config = get_jwt_auth_config()
+            self.assertEqual(config.header_key, "HTTP_X_TOKEN")
+            self.assertEqual(config.auth_prefix, b"bearer")
+
+            auth = JSONWebTokenAuthenticationQS()
+            self.assertEqual(auth.auth_prefix, b"bearer")
+            request = APIRequestFactory().get("/", HTTP_X_TOKEN="Bearer token")
+            self.assertEqual(auth.get_jwt_value(request), b"token")
+            request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="JWT token")
+            request.COOKIES["jwt"] = "cookie"
+            self.assertEqual(auth.get_jwt_value(request), "cookie")
+
+        self.assertEqual(get_jwt_auth_config().header_key, "HTTP_AUTHORIZATION")
+
+    @override_settings(DRFADDONS_JWT_CACHE=True)
+    def test_cache_skips_verification_and_lookup(self):
+        stats = get_jwt_cache().stats
+
+        with self.assertNumQueries(1):
+            self.authenticate(self.token)
+        with self.assertNumQueries(0):
+            user, token = self.authenticate(self.token)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+
+        # Invalid tokens are never cached
+        for _ in range(2):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(self.token + "x")
+        self.assertEqual(stats.hits, 1)
+
+    def test_authenticate_tokens(self):
+        inactive = get_user_model().objects.create(username="inactive")
+        inactive.is_active = False
+        inactive.save()
+        deleted = get_user_model().objects.create(username="deleted")
+        deleted_token = make_token(deleted)
+        deleted.delete()
+
+        tokens = [
+            self.token,
+            self.token.encode(),
+            make_token(inactive),
+            deleted_token,
+            "invalid",
+        ]
+        for max_workers in (None, 4):
+            with self.subTest(max_workers=max_workers):
+                with self.assertNumQueries(1):
+                    results = JSONWebTokenAuthenticationQS().authenticate_tokens(
+                        tokens, max_workers=max_workers
+                    )
+
+                self.assertEqual(
+                    [result["success"] for result in results],
+                    [True, True, False, False, False],
+                )
+                self.assertEqual(results[0]["user"], self.user)
+                self.assertEqual(results[1]["payload"]["username"], "user")
+                self.assertEqual(
+                    [result["message"] for result in results[2:]],
+                    [
+                        "User account is disabled.",
+                        "Invalid signature.",
+                        "Error decoding signature.",
+                    ],
+                )
+
+    @override_settings(DRFADDONS_JWT_CACHE=True)
+    def test_authenticate_tokens_uses_cache(self):
+        self.authenticate(self.token)
+
+        with self.assertNumQueries(0):
+            results = JSONWebTokenAuthenticationQS().authenticate_tokens([self.token])
+        self.assertEqual(results[0]["user"], self.user)
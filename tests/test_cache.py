@@ -0,0 +1,215 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from drfaddons.cache import JWTCache
+from drfaddons.cache import OwnerCacheMixin
+from drfaddons.cache import get_jwt_cache
+from drfaddons.filters import HasPermissionFilterBackend
+from drfaddons.filters import IsOwnerOrSuperuser
+from drfaddons.generics import OwnerListAPIView
+from drfaddons.generics import OwnerRetrieveAPIView
+from tests.helpers import NoteSerializer
+from tests.models import Note
+
+
+class CachedNoteListView(OwnerCacheMixin, OwnerListAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    filterset_fields = ("title",)
+
+
+class CachedAllNoteListView(OwnerCacheMixin, OwnerListAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    filter_backends = (IsOwnerOrSuperuser,)
+
+
+class CachedNoteDetailView(OwnerCacheMixin, OwnerRetrieveAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+
+
+class TestOwnerCacheMixin(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.other = get_user_model().objects.create(username="other")
+        cls.note = Note.objects.create(title="note", created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, view, user=None, path="/", **kwargs):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=user or self.user)
+        return view.as_view()(request, **kwargs)
+
+    def test_caches_list(self):
+        stats = CachedNoteListView.get_cache_stats()
+        hits, misses = stats.hits, stats.misses
+
+        with self.assertNumQueries(1):
+            self.get(CachedNoteListView)
+        with self.assertNumQueries(0):
+            response = self.get(CachedNoteListView)
+
+        self.assertEqual(
+            response.data, [{"id": self.note.pk, "title": "note", "priority": 0}]
+        )
+        self.assertEqual((stats.hits - hits, stats.misses - misses), (1, 1))
+
+    def test_keyed_by_user_and_params(self):
+        self.get(CachedNoteListView)
+
+        response = self.get(CachedNoteListView, user=self.other)
+        self.assertEqual(response.data, [])
+
+        response = self.get(CachedNoteListView, path="/?title=other")
+        self.assertEqual(response.data, [])
+
+    def test_invalidated_on_save_and_delete(self):
+        self.get(CachedNoteDetailView, pk=self.note.pk)
+
+        self.note.title = "edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.note.save()
+        response = self.get(CachedNoteDetailView, pk=self.note.pk)
+        self.assertEqual(response.data["title"], "edited")
+
+        self.get(CachedNoteListView)
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title="new", created_by=self.user)
+        response = self.get(CachedNoteListView)
+        self.assertEqual(len(response.data), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.note.delete()
+        response = self.get(CachedNoteListView)
+        self.assertEqual(len(response.data), 1)
+
+    def test_invalidated_on_save_of_some_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.note.save()
+        self.get(CachedNoteListView)
+
+        # update_fields leaves update_date as it was
+        self.note.title = "edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.note.save(update_fields=["title"])
+
+        response = self.get(CachedNoteListView)
+        self.assertEqual(response.data[0]["title"], "edited")
+
+    def test_invalidated_on_commit(self):
+        self.get(CachedNoteListView)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Note.objects.create(title="new", created_by=self.user)
+            # Not committed yet, version is unchanged
+            with self.assertNumQueries(0):
+                self.get(CachedNoteListView)
+
+        for callback in callbacks:
+            callback()
+        response = self.get(CachedNoteListView)
+        self.assertEqual(len(response.data), 2)
+
+    def test_privileged_users_are_not_cached(self):
+        admin = get_user_model().objects.create(username="admin", is_superuser=True)
+
+        response = self.get(CachedAllNoteListView, user=admin)
+        self.assertEqual(len(response.data), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title="other", created_by=self.other)
+
+        response = self.get(CachedAllNoteListView, user=admin)
+        self.assertEqual(len(response.data), 2)
+
+        # Owner scoped for other users
+        self.get(CachedAllNoteListView)
+        with self.assertNumQueries(0):
+            self.get(CachedAllNoteListView)
+
+    def test_not_owner_scoped_views_are_not_cached(self):
+        view = CachedNoteListView.as_view(filter_backends=(HasPermissionFilterBackend,))
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.user)
+        view(request)
+
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.user)
+        with self.assertNumQueries(1):
+            view(request)
+
+    def test_other_users_changes_keep_cache(self):
+        self.get(CachedNoteListView)
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title="other", created_by=self.other)
+
+        with self.assertNumQueries(0):
+            self.get(CachedNoteListView)
+
+    def test_errors_are_not_cached(self):
+        response = self.get(CachedNoteDetailView, pk=999)
+        self.assertEqual(response.status_code, 404)
+
+        # bulk_create sends no signal, response must not have been cached
+        Note.objects.bulk_create([Note(id=999, title="new", created_by=self.user)])
+        response = self.get(CachedNoteDetailView, pk=999)
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_models_have_no_receivers(self):
+        self.assertTrue(post_delete.has_listeners(Note))
+        self.assertFalse(post_delete.has_listeners(get_user_model()))
+
+
+class TestJWTCache(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_lru_eviction_and_stats(self):
+        jwt_cache = JWTCache(maxsize=2)
+        jwt_cache.set("a", {}, "user a")
+        jwt_cache.set(b"b", {}, "user b")
+        self.assertEqual(jwt_cache.get(b"a"), ({}, "user a"))
+
+        jwt_cache.set("c", {}, "user c")
+        self.assertIsNone(jwt_cache.get("b"))
+        self.assertEqual(jwt_cache.get("a")[1], "user a")
+        self.assertEqual((jwt_cache.stats.hits, jwt_cache.stats.misses), (2, 1))
+
+    def test_expiry(self):
+        jwt_cache = JWTCache()
+        jwt_cache.set("expired", {"exp": int(time.time()) - 1}, "user")
+        jwt_cache.set("expiring", {"exp": time.time() + 0.05}, "user")
+        self.assertIsNone(jwt_cache.get("expired"))
+        self.assertIsNotNone(jwt_cache.get("expiring"))
+
+        time.sleep(0.06)
+        self.assertIsNone(jwt_cache.get("expiring"))
+
+    def test_shared_through_django_cache(self):
+        JWTCache(alias="default").set("token", {"user_id": 1}, "user")
+
+        jwt_cache = JWTCache(alias="default")
+        self.assertEqual(jwt_cache.get("token"), ({"user_id": 1}, "user"))
+
+        jwt_cache.delete("token")
+        self.assertIsNone(JWTCache(alias="default").get("token"))
+
+    def test_get_jwt_cache(self):
+        self.assertIsNone(get_jwt_cache())
+
+        with override_settings(DRFADDONS_JWT_CACHE=True):
+            jwt_cache = get_jwt_cache()
+            self.assertIs(get_jwt_cache(), jwt_cache)
+            with override_settings(DRFADDONS_JWT_CACHE_SIZE=1):
+                self.assertEqual(get_jwt_cache().maxsize, 1)
@@ -0,0 +1,212 @@
+import time
+
+import sendsms
+from asgiref.sync import async_to_sync
+from django.core import mail
+from django.test import override_settings
+from django.test import TestCase
+
+from drfaddons.delivery import MessageQueue
+from drfaddons.utils import asend_message
+from drfaddons.utils import send_message
+from drfaddons.utils import send_messages
+from tests.backends import CountingEmailBackend
+from tests.backends import FailingSmsBackend
+
+
+@override_settings(EMAIL_HOST="localhost")
+class TestMessageQueue(TestCase):
+    def test_send_message_queued(self):
+        sent = send_message(
+            message="Hello",
+            subject="Queued",
+            recip=["user@django.com"],
+            recip_email=[],
+            queued=True,
+        )
+
+        self.assertTrue(sent["success"])
+        self.assertTrue(sent["result"].result(timeout=5)["success"])
+        self.assertEqual(mail.outbox[-1].subject, "Queued")
+
+    def test_invalid_message_is_not_queued(self):
+        with self.assertRaises(ValueError):
+            send_message(
+                message="Hello",
+                subject="Invalid",
+                recip=["user@django.com", "1234567890"],
+                recip_email=[],
+                queued=True,
+            )
+
+    @override_settings(EMAIL_BACKEND="tests.backends.FlakyEmailBackend")
+    def test_retries_failed_message(self):
+        message_queue = MessageQueue(batch_size=10, retries=1, backoff=0)
+
+        results = [
+            message_queue.put(
+                message="Hello",
+                subject="Retry {}".format(i),
+                recip=["user@django.com"],
+                recip_email=[],
+            )
+            for i in range(3)
+        ]
+
+        self.assertTrue(message_queue.flush(timeout=5))
+        self.assertTrue(all(result.result()["success"] for result in results))
+        self.assertEqual(
+            sorted(message.subject for message in mail.outbox),
+            ["Retry 0", "Retry 1", "Retry 2"],
+        )
+
+    @override_settings(SENDSMS_BACKEND="tests.backends.FailingSmsBackend")
+    def test_retries_sms_only(self):
+        FailingSmsBackend.attempts = 0
+        message_queue = MessageQueue(retries=3, backoff=0)
+
+        result = message_queue.put(
+            message="Your OTP is 1234",
+            subject="OTP",
+            recip=["9876543210"],
+            recip_email=["user@django.com"],
+        )
+
+        self.assertFalse(result.result(timeout=5)["success"])
+        self.assertEqual(FailingSmsBackend.attempts, 4)
+        # Fallback email is sent once, not on every retry
+        self.assertEqual([message.to for message in mail.outbox], [["user@django.com"]])
+
+    @override_settings(EMAIL_BACKEND="tests.backends.FailingCloseEmailBackend")
+    def test_close_failure_does_not_resend(self):
+        message_queue = MessageQueue(backoff=0)
+
+        for i in range(2):
+            result = message_queue.put(
+                message="Hello",
+                subject="Close {}".format(i),
+                recip=["user@django.com"],
+                recip_email=[],
+            )
+            self.assertTrue(result.result(timeout=5)["success"])
+
+        self.assertTrue(message_queue.flush(timeout=5))
+        self.assertEqual(
+            [message.subject for message in mail.outbox], ["Close 0", "Close 1"]
+        )
+
+    @override_settings(EMAIL_BACKEND="tests.backends.FlakyEmailBackend")
+    def test_gives_up_after_retries(self):
+        message_queue = MessageQueue(retries=0, backoff=0)
+
+        result = message_queue.put(
+            message="Hello",
+            subject="Give up",
+            recip=["user@django.com"],
+            recip_email=[],
+        )
+
+        self.assertFalse(result.result(timeout=5)["success"])
+        self.assertEqual(mail.outbox, [])
+
+
+@override_settings(EMAIL_BACKEND="tests.backends.CountingEmailBackend")
+class TestSendMessages(TestCase):
+    def test_sends_over_one_connection(self):
+        CountingEmailBackend.opened = 0
+        batch = [
+            {"message": "Hi", "subject": "Hello", "recip": ["a@django.com"]},
+            {"message": "Hi", "subject": "Hello", "recip": ["b@django.com"]},
+            {
+                "message": "Bye",
+                "subject": "Goodbye",
+                "recip": ["a@django.com", "invalid"],
+                "html_message": "<p>Bye</p>",
+            },
+        ]
+
+        sent = send_messages(batch)
+
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        # One email per item, recipients of items are never merged
+        self.assertEqual(
+            [message.to for message in mail.outbox],
+            [["a@django.com"], ["b@django.com"], ["a@django.com"]],
+        )
+        self.assertTrue(sent[0]["success"])
+        self.assertEqual(sent[1]["recipients"], {"b@django.com": True})
+        self.assertFalse(sent[2]["success"])
+        self.assertEqual(
+            sent[2]["recipients"], {"a@django.com": True, "invalid": False}
+        )
+        self.assertEqual(sent[2]["message"], "Invalid email provided: invalid")
+
+    @override_settings(EMAIL_BACKEND="tests.backends.FlakyEmailBackend")
+    def test_reports_failed_emails(self):
+        sent = send_messages(
+            [{"message": "Hi", "subject": "Fails once", "recip": ["a@django.com"]}]
+        )
+
+        self.assertFalse(sent[0]["success"])
+        self.assertEqual(sent[0]["recipients"], {"a@django.com": False})
+        self.assertTrue(sent[0]["message"].startswith("Message sending failed!"))
+
+
+@override_settings(
+    EMAIL_HOST="localhost", SENDSMS_BACKEND="sendsms.backends.locmem.SmsBackend"
+)
+class TestAsendMessage(TestCase):
+    def send(self, recip, recip_email, **kwargs):
+        return async_to_sync(asend_message)(
+            message="Your OTP is 1234",
+            subject="OTP",
+            recip=recip,
+            recip_email=recip_email,
+            **kwargs
+        )
+
+    def test_email(self):
+        sent = self.send(["user@django.com"], [])
+
+        self.assertTrue(sent["success"])
+        self.assertEqual(list(sent["channels"]), ["email"])
+        self.assertEqual(mail.outbox[-1].to, ["user@django.com"])
+
+    def test_sms_and_email(self):
+        sent = self.send(["+91 98765-43210"], ["user@django.com"])
+
+        self.assertTrue(sent["success"])
+        self.assertTrue(sent["channels"]["sms"]["success"])
+        self.assertTrue(sent["channels"]["email"]["success"])
+        self.assertEqual(sendsms.outbox[-1].to, ["+919876543210"])
+        self.assertEqual(mail.outbox[-1].to, ["user@django.com"])
+
+    @override_settings(
+        SENDSMS_BACKEND="tests.backends.SlowSmsBackend",
+        EMAIL_BACKEND="tests.backends.SlowEmailBackend",
+    )
+    def test_channels_are_concurrent(self):
+        async def send():
+            # Timed inside the event loop, as async_to_sync waits for
+            # the timed out SMS thread on shutdown of its loop
+            start = time.monotonic()
+            sent = await asend_message(
+                message="Your OTP is 1234",
+                subject="OTP",
+                recip=["9876543210"],
+                recip_email=["user@django.com"],
+                sms_timeout=0.3,
+            )
+            return sent, time.monotonic() - start
+
+        sent, elapsed = async_to_sync(send)()
+
+        self.assertFalse(sent["success"])
+        self.assertEqual(sent["message"], "Message sending timed out!")
+        self.assertTrue(sent["channels"]["email"]["success"])
+        # Slower of SMS timeout (0.3) & email (0.2), not SMS (0.5) + email
+        self.assertLess(elapsed, 0.45)
+
+    def test_invalid_recipients_raise(self):
+        with self.assertRaises(ValueError):
+            self.send(["user@django.com", "9876543210"], [])
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django_filters.rest_framework.backends import DjangoFilterBackend
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from drfaddons.filters import HasPermissionOrSuperuser
+from drfaddons.filters import IsOwnerOrSuperuser
+from drfaddons.generics import OwnerListAPIView
+from tests.helpers import NoteSerializer
+from tests.helpers import StaffCheck
+from tests.models import Note
+
+
+class NoteListView(OwnerListAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    filter_backends = (
+        IsOwnerOrSuperuser,
+        HasPermissionOrSuperuser,
+        DjangoFilterBackend,
+    )
+    filterset_fields = ("priority",)
+
+
+class TestIsOwnerOrSuperuser(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create(username="user")
+        cls.staff = User.objects.create(username="staff", is_staff=True)
+        cls.admin = User.objects.create(username="admin", is_superuser=True)
+        Note.objects.bulk_create(
+            [Note(title=str(i), priority=i % 2, created_by=cls.user) for i in range(4)]
+            + [Note(title="staff", created_by=cls.staff)]
+        )
+
+    def list(self, user, path="/"):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=user)
+        return NoteListView.as_view()(request)
+
+    def test_filters_non_superuser(self):
+        response = self.list(self.user)
+        self.assertEqual(len(response.data), 4)
+
+        response = self.list(self.staff)
+        self.assertEqual(len(response.data), 1)
+
+    def test_superuser_sees_all(self):
+        response = self.list(self.admin)
+        self.assertEqual(len(response.data), 5)
+
+    def test_single_query_without_join(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.list(self.user, path="/?priority=1")
+
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"]
+        self.assertNotIn("JOIN", sql)
+        self.assertIn('"created_by_id" = {}'.format(self.user.pk), sql)
+        self.assertIn('"priority" = 1', sql)
+
+    @override_settings(DRFADDONS_PRIVILEGED_USER="tests.helpers.is_staff")
+    def test_privileged_user_setting(self):
+        StaffCheck.calls = 0
+
+        response = self.list(self.staff)
+
+        self.assertEqual(len(response.data), 5)
+        # Evaluated once per request, although used by two backends
+        self.assertEqual(StaffCheck.calls, 1)
+
+        response = self.list(self.admin)
+        self.assertEqual(len(response.data), 0)
@@ -0,0 +1,526 @@
+from unittest import skipIf
+
+import django
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from drfaddons.filters import HasPermissionFilterBackend
+from drfaddons.filters import HasPermissionOrSuperuser
+from drfaddons.generics import AsyncCreateRetrieveUpdateDestroyByUserAPIView
+from drfaddons.generics import AsyncOwnerListCreateAPIView
+from drfaddons.generics import AsyncOwnerRetrieveUpdateDestroyAPIView
+from drfaddons.generics import OwnerBulkCreateUpdateDestroyAPIView
+from drfaddons.generics import OwnerListAPIView
+from drfaddons.generics import OwnerRetrieveUpdateDestroyAPIView
+from drfaddons.permissions import IAWPOrSuperuser
+from drfaddons.permissions import IsAuthenticatedWithPermission
+from drfaddons.serializers import ByOwnerSerializer
+from tests.helpers import NoteSerializer
+from tests.models import Document
+from tests.models import Note
+from tests.models import Profile
+from tests.models import Tag
+
+
+class NoteDetailView(OwnerRetrieveUpdateDestroyAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+
+
+class TestOwnerPermission(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.note = Note.objects.create(title="note", created_by=cls.user)
+
+    def request(self, method, view, data=None):
+        request = getattr(APIRequestFactory(), method)("/", data, format="json")
+        force_authenticate(request, user=self.user)
+        return view(request, pk=self.note.pk)
+
+    def test_no_extra_queries(self):
+        for permission in (None, IsAuthenticatedWithPermission, IAWPOrSuperuser):
+            initkwargs = {"permission_classes": (permission,)} if permission else {}
+            view = NoteDetailView.as_view(**initkwargs)
+
+            with self.subTest(permission=permission):
+                # SELECT object
+                with self.assertNumQueries(1):
+                    response = self.request("get", view)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+                # SELECT object, UPDATE object
+                with self.assertNumQueries(2):
+                    response = self.request("patch", view, {"title": "edited"})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # SELECT object, DELETE object
+        with self.assertNumQueries(2):
+            response = self.request("delete", NoteDetailView.as_view())
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_other_user_is_not_owner(self):
+        other = get_user_model().objects.create(username="other")
+
+        with self.assertNumQueries(0):
+            self.assertFalse(self.note.is_owner(other))
+            self.assertTrue(self.note.is_owner(self.user))
+
+
+class NoteListView(OwnerListAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    filter_backends = (HasPermissionFilterBackend,)
+    permission_classes = (IsAuthenticatedWithPermission,)
+
+
+class TestHasPermissionFilterBackend(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.admin = get_user_model().objects.create(username="admin", is_superuser=True)
+        Note.objects.bulk_create(
+            [Note(title=str(i), created_by=cls.user) for i in range(5)]
+            + [Note(title="admin", created_by=cls.admin)]
+        )
+
+    def list(self, user, **initkwargs):
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=user)
+        return NoteListView.as_view(**initkwargs)(request)
+
+    def test_filters_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.list(self.user)
+
+        self.assertEqual(len(response.data), 5)
+
+    def test_superuser_sees_all(self):
+        response = self.list(self.admin)
+        self.assertEqual(len(response.data), 1)
+
+        response = self.list(self.admin, filter_backends=(HasPermissionOrSuperuser,))
+        self.assertEqual(len(response.data), 6)
+
+    def test_anonymous_user_sees_nothing(self):
+        self.assertFalse(
+            Note.objects.filter(Note.permission_filter(AnonymousUser())).exists()
+        )
+
+
+class ConditionalNoteListView(OwnerListAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    conditional_get = True
+
+
+class ConditionalNoteDetailView(OwnerRetrieveUpdateDestroyAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    conditional_get = True
+
+
+class TestConditionalGet(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.note = Note.objects.create(title="note", created_by=cls.user)
+
+    def get(self, view, headers=None, **kwargs):
+        request = APIRequestFactory().get("/", **(headers or {}))
+        force_authenticate(request, user=self.user)
+        return view.as_view()(request, **kwargs)
+
+    def test_retrieve(self):
+        response = self.get(ConditionalNoteDetailView, pk=self.note.pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):
+            response = self.get(
+                ConditionalNoteDetailView,
+                {"HTTP_IF_NONE_MATCH": response["ETag"]},
+                pk=self.note.pk,
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.get(
+            ConditionalNoteDetailView,
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+            pk=self.note.pk,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_modified(self):
+        response = self.get(ConditionalNoteDetailView, pk=self.note.pk)
+        self.note.save()
+
+        response = self.get(
+            ConditionalNoteDetailView,
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            pk=self.note.pk,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list(self):
+        response = self.get(ConditionalNoteListView)
+        etag = response["ETag"]
+
+        # Aggregate only, objects are not fetched
+        with self.assertNumQueries(1):
+            response = self.get(ConditionalNoteListView, {"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Note.objects.create(title="new", created_by=self.user)
+        response = self.get(ConditionalNoteListView, {"HTTP_IF_NONE_MATCH": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_disabled_by_default(self):
+        response = self.get(NoteDetailView, pk=self.note.pk)
+        self.assertFalse(response.has_header("ETag"))
+
+
+class NoteBulkView(OwnerBulkCreateUpdateDestroyAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+
+
+class UpperNoteSerializer(NoteSerializer):
+    def create(self, validated_data):
+        validated_data["title"] = validated_data["title"].upper()
+        return super(UpperNoteSerializer, self).create(validated_data)
+
+
+class ProfileByOwnerSerializer(ByOwnerSerializer):
+    class Meta:
+        model = Profile
+        fields = ("id", "bio", "created_by")
+
+
+class TestBulkViews(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.other = get_user_model().objects.create(username="other")
+        cls.notes = [
+            Note.objects.create(title=str(i), created_by=cls.user) for i in range(3)
+        ]
+        cls.foreign = Note.objects.create(title="foreign", created_by=cls.other)
+
+    def request(self, method, data, **initkwargs):
+        request = getattr(APIRequestFactory(), method)("/", data, format="json")
+        force_authenticate(request, user=self.user)
+        return NoteBulkView.as_view(**initkwargs)(request)
+
+    def test_bulk_create(self):
+        # INSERT in a savepoint, or an INSERT per item where database
+        # doesn't return primary keys from bulk inserts
+        bulk = connection.features.can_return_rows_from_bulk_insert
+        with self.assertNumQueries(3 if bulk else 4):
+            response = self.request("post", [{"title": "a"}, {"title": "b"}])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([obj["title"] for obj in response.data], ["a", "b"])
+        self.assertTrue(all(obj["id"] for obj in response.data))
+        self.assertEqual(
+            Note.objects.filter(created_by=self.user, title__in="ab").count(), 2
+        )
+
+    def test_bulk_create_uses_serializer_create(self):
+        response = self.request(
+            "post",
+            [{"title": "a"}, {"title": "b"}],
+            serializer_class=UpperNoteSerializer,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([obj["title"] for obj in response.data], ["A", "B"])
+        self.assertEqual(
+            Note.objects.filter(created_by=self.user, title__in="AB").count(), 2
+        )
+
+    def test_bulk_create_one_object_by_owner(self):
+        view = {
+            "queryset": Profile.objects.all(),
+            "serializer_class": ProfileByOwnerSerializer,
+        }
+
+        response = self.request("post", [{"bio": "a"}, {"bio": "b"}], **view)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Profile.objects.exists())
+
+        response = self.request("post", [{"bio": "a"}], **view)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Profile.objects.get().created_by, self.user)
+
+    def test_bulk_create_validates_all(self):
+        response = self.request("post", [{"title": "a"}, {"priority": 1}])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", response.data[1])
+        self.assertFalse(Note.objects.filter(title="a").exists())
+
+    def test_bulk_update(self):
+        data = [{"id": note.pk, "title": note.title + "!"} for note in self.notes]
+
+        # SELECT, UPDATE in a savepoint
+        with self.assertNumQueries(4):
+            response = self.request("patch", data)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(Note.objects.filter(created_by=self.user).values_list("title")),
+            [("0!",), ("1!",), ("2!",)],
+        )
+        note = Note.objects.get(pk=self.notes[0].pk)
+        self.assertGreater(note.update_date, self.notes[0].update_date)
+
+    def test_bulk_update_enforces_ownership(self):
+        response = self.request(
+            "patch",
+            [
+                {"id": self.notes[0].pk, "title": "mine"},
+                {"id": self.foreign.pk, "title": "stolen"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Note.objects.filter(title__in=["mine", "stolen"]).exists())
+
+    def test_bulk_destroy(self):
+        ids = [note.pk for note in self.notes[:2]]
+
+        # SELECT owned, SELECT and DELETE objects in a savepoint. Delete
+        # receivers of drfaddons.cache make Django fetch objects first.
+        with self.assertNumQueries(5):
+            response = self.request("delete", ids)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(Note.objects.filter(created_by=self.user).count(), 1)
+
+    def test_bulk_destroy_enforces_ownership(self):
+        response = self.request("delete", [self.notes[0].pk, self.foreign.pk])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Note.objects.count(), 4)
+
+    def test_invalid_ids(self):
+        response = self.request("delete", [self.notes[0].pk, self.notes[0].pk])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.request("delete", ["a"])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.request("delete", {"id": 1})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class UserSerializer(serializers.ModelSerializer):
+    # Reverse relation, by its accessor name
+    note_set = NoteSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = get_user_model()
+        fields = ("id", "username", "note_set")
+
+
+class TagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ("id", "name")
+
+
+class DocumentSerializer(serializers.ModelSerializer):
+    created_by = UserSerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    tag_names = serializers.StringRelatedField(source="tags", many=True)
+    owner = serializers.CharField(source="created_by.username", read_only=True)
+
+    class Meta:
+        model = Document
+        fields = ("id", "title", "created_by", "tags", "tag_names", "owner")
+
+
+class OptimizedDocumentListView(OwnerListAPIView):
+    queryset = Document.objects.all()
+    serializer_class = DocumentSerializer
+    optimize_queryset = True
+
+
+class TestOptimizeQueryset(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.tags = [Tag.objects.create(name=name) for name in "ab"]
+        Note.objects.create(title="note", created_by=cls.user)
+
+    def create_documents(self, count):
+        for i in range(count):
+            document = Document.objects.create(title=str(i), created_by=self.user)
+            document.tags.set(self.tags)
+
+    def list(self):
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.user)
+        return OptimizedDocumentListView.as_view()(request)
+
+    def test_query_plan(self):
+        view = OptimizedDocumentListView()
+        view.format_kwarg = None
+
+        plan = view.get_query_plan(Document)
+
+        self.assertEqual(plan["select_related"], {"created_by"})
+        self.assertEqual(plan["prefetch_related"], {"tags", "created_by__note_set"})
+        self.assertEqual(plan["only"], {"id", "title", "created_by", "update_date"})
+        self.assertIs(view.get_query_plan(Document), plan)
+
+    def test_constant_queries(self):
+        # SELECT documents joined with users, SELECT tags, SELECT notes
+        self.create_documents(2)
+        with self.assertNumQueries(3):
+            response = self.list()
+        self.assertEqual(len(response.data), 2)
+
+        self.create_documents(8)
+        with self.assertNumQueries(3):
+            response = self.list()
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0]["owner"], "user")
+        self.assertEqual(response.data[0]["tag_names"], ["a", "b"])
+        self.assertEqual(response.data[0]["created_by"]["note_set"][0]["title"], "note")
+
+
+class AsyncNoteListView(AsyncOwnerListCreateAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+
+
+class AsyncNoteDetailView(AsyncOwnerRetrieveUpdateDestroyAPIView):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+    conditional_get = True
+
+
+class AsyncFilteredNoteListView(AsyncNoteListView):
+    filterset_fields = ("created_by",)
+
+
+class AsyncFilteredNoteDetailView(AsyncNoteDetailView):
+    filterset_fields = ("created_by",)
+
+
+class ProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Profile
+        fields = ("id", "bio")
+
+
+class AsyncProfileView(AsyncCreateRetrieveUpdateDestroyByUserAPIView):
+    queryset = Profile.objects.all()
+    serializer_class = ProfileSerializer
+
+
+@skipIf(django.VERSION < (4, 2), "Async ORM requires Django 4.2+")
+class TestAsyncViews(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        cls.other = get_user_model().objects.create(username="other")
+        cls.note = Note.objects.create(title="note", created_by=cls.user)
+        cls.foreign = Note.objects.create(title="foreign", created_by=cls.other)
+
+    def request(self, method, view, data=None, user=None, headers=None, **kwargs):
+        request = getattr(APIRequestFactory(), method)(
+            "/", data, format="json", **(headers or {})
+        )
+        force_authenticate(request, user=user or self.user)
+        return async_to_sync(view.as_view())(request, **kwargs)
+
+    def test_is_async(self):
+        self.assertTrue(AsyncNoteDetailView.view_is_async)
+
+    def test_list_and_create(self):
+        with self.assertNumQueries(1):
+            response = self.request("get", AsyncNoteListView)
+        self.assertEqual(
+            response.data, [{"id": self.note.pk, "title": "note", "priority": 0}]
+        )
+
+        response = self.request("post", AsyncNoteListView, {"title": "new"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Note.objects.filter(title="new", created_by=self.user).exists())
+
+    def test_related_filterset_field(self):
+        # Filter backend validates created_by with a query
+        filters = {"created_by": self.user.pk}
+
+        response = self.request("get", AsyncFilteredNoteListView, filters)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([obj["id"] for obj in response.data], [self.note.pk])
+
+        response = self.request(
+            "get", AsyncFilteredNoteDetailView, filters, pk=self.note.pk
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "note")
+
+    def test_retrieve_update_destroy(self):
+        with self.assertNumQueries(1):
+            response = self.request("get", AsyncNoteDetailView, pk=self.note.pk)
+        self.assertEqual(response.data["title"], "note")
+
+        response = self.request(
+            "get",
+            AsyncNoteDetailView,
+            headers={"HTTP_IF_NONE_MATCH": response["ETag"]},
+            pk=self.note.pk,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.request(
+            "patch", AsyncNoteDetailView, {"title": "edited"}, pk=self.note.pk
+        )
+        self.assertEqual(response.data["title"], "edited")
+
+        response = self.request("delete", AsyncNoteDetailView, pk=self.note.pk)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Note.objects.filter(pk=self.note.pk).exists())
+
+    def test_ownership(self):
+        response = self.request("get", AsyncNoteDetailView, pk=self.foreign.pk)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.request(
+            "patch", AsyncNoteDetailView, {"title": "stolen"}, pk=self.foreign.pk
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.request("get", AsyncNoteDetailView, pk="invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_validation_error(self):
+        response = self.request(
+            "patch", AsyncNoteDetailView, {"priority": "high"}, pk=self.note.pk
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_by_user(self):
+        response = self.request("get", AsyncProfileView)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.request("post", AsyncProfileView, {"bio": "hello"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.request("get", AsyncProfileView)
+        self.assertEqual(response.data["bio"], "hello")
+
+        response = self.request("get", AsyncProfileView, user=self.other)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,23 @@
+from django.db import connection
+from django.test import TestCase
+
+from tests.models import Note
+from tests.models import Profile
+
+
+class TestOwnerIndexes(TestCase):
+    def indexed_columns(self, model):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        return [c["columns"] for c in constraints.values() if c["index"]]
+
+    def test_owner_indexes(self):
+        columns = self.indexed_columns(Note)
+
+        self.assertIn(["created_by_id", "create_date"], columns)
+        self.assertIn(["created_by_id", "update_date"], columns)
+
+    def test_not_added_by_default(self):
+        self.assertEqual(Profile._meta.indexes, [])
@@ -0,0 +1,116 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db import OperationalError
+from django.test import TestCase
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from drfaddons.generics import OwnerCreateAPIView
+from drfaddons.serializers import ByOwnerSerializer
+from tests.models import Note
+from tests.models import Profile
+
+
+class NoteSerializer(ByOwnerSerializer):
+    class Meta:
+        model = Note
+        fields = ("id", "title", "created_by")
+
+
+class ProfileSerializer(ByOwnerSerializer):
+    class Meta:
+        model = Profile
+        fields = ("id", "bio", "created_by")
+
+
+class NoteCreateView(OwnerCreateAPIView):
+    serializer_class = NoteSerializer
+
+
+class ProfileCreateView(OwnerCreateAPIView):
+    serializer_class = ProfileSerializer
+
+
+def create(view, user, data):
+    request = APIRequestFactory().post("/", data, format="json")
+    force_authenticate(request, user=user)
+    return view.as_view()(request)
+
+
+class TestByOwnerSerializer(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+
+    def test_checks_existence(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = create(NoteCreateView, self.user, {"title": "first"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("COUNT", queries[0]["sql"])
+        self.assertIn("LIMIT 1", queries[0]["sql"])
+
+        response = create(NoteCreateView, self.user, {"title": "second"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unique_owner_is_not_queried(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = create(ProfileCreateView, self.user, {"bio": "first"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(any(q["sql"].startswith("SELECT") for q in queries))
+
+        response = create(ProfileCreateView, self.user, {"bio": "second"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Profile.objects.count(), 1)
+
+    def test_update_is_allowed(self):
+        profile = Profile.objects.create(created_by=self.user)
+        request = APIRequestFactory().post("/")
+        request.user = self.user
+
+        serializer = ProfileSerializer(
+            profile, data={"bio": "edited"}, context={"request": request}
+        )
+
+        self.assertTrue(serializer.is_valid())
+
+
+class TestByOwnerSerializerConcurrency(TransactionTestCase):
+    def test_concurrent_creates(self):
+        user = get_user_model().objects.create(username="user")
+        barrier = threading.Barrier(8)
+        responses = []
+
+        def post():
+            try:
+                barrier.wait()
+                # Gives up after about a second, the assertions below fail
+                for attempt in range(100):
+                    try:
+                        response = create(ProfileCreateView, user, {"bio": "bio"})
+                    except OperationalError:
+                        # SQLite locks whole table on concurrent writes,
+                        # unlike row level locking of other databases.
+                        time.sleep(0.01)
+                    else:
+                        responses.append(response)
+                        return
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(Profile.objects.filter(created_by=user).count(), 1)
+        self.assertEqual(
+            sorted(response.status_code for response in responses),
+            [status.HTTP_201_CREATED] + [status.HTTP_400_BAD_REQUEST] * 7,
+        )
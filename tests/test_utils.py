@@ -1,7 +1,42 @@
+import base64
+import ipaddress
+import json
+import uuid
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.test import RequestFactory
 from django.test import TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
 
+from drfaddons.utils import JSON_BACKENDS
+from drfaddons.utils import classify_recipient
+from drfaddons.utils import encode_cursor
+from drfaddons.utils import get_client_ip
+from drfaddons.utils import get_mobile_number
+from drfaddons.utils import group_queryset_by_fields
+from drfaddons.utils import groupby_queryset_with_fields
+from drfaddons.utils import iter_queryset_groups
+from drfaddons.utils import JsonResponse
+from drfaddons.utils import keyset_paginate_data
+from drfaddons.utils import normalize_recipients
+from drfaddons.utils import paginate_data
+from drfaddons.utils import parse_ip
+from drfaddons.utils import queryset_paginate_data
+from drfaddons.utils import resolve_client_ip
+from drfaddons.utils import StreamingJsonResponse
+from drfaddons.utils import TrustedNetworks
 from drfaddons.utils import validate_email
 from drfaddons.utils import validate_mobile
+from tests.helpers import NoteSerializer
+from tests.helpers import SearchSerializer
+from tests.models import Note
 
 
 class TestUtils(TestCase):
@@ -18,3 +53,490 @@ class TestUtils(TestCase):
 
         self.assertTrue(validate_mobile(valid_mobile))
         self.assertFalse(validate_mobile(invalid_mobile))
+
+    def test_get_mobile_number(self):
+        self.assertEqual(get_mobile_number("+91 (987) 654-32.1,0"), "+919876543210")
+
+    def test_normalize_recipients(self):
+        recipients = normalize_recipients(
+            [
+                "user@django.com",
+                "98765 43210",
+                "user@",
+                "(987) 654-3210",
+                "+91 98765-43210",
+                "12345",
+                None,
+                "user@django.com",
+            ]
+        )
+
+        self.assertEqual(recipients["emails"], ["user@django.com"])
+        self.assertEqual(recipients["mobiles"], ["9876543210", "+919876543210"])
+        self.assertEqual(recipients["invalid"], ["user@", "12345", None])
+
+    def test_classify_recipient_is_cached(self):
+        classify_recipient.cache_clear()
+        for attempt in range(3):
+            self.assertEqual(
+                classify_recipient("user@django.com"), (True, "user@django.com")
+            )
+        self.assertEqual(classify_recipient.cache_info().hits, 2)
+
+
+def search(**data):
+    serializer = SearchSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    return serializer
+
+
+class TestKeysetPagination(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create(username="user")
+        # Duplicate priorities ensure pk is used as a tie breaker.
+        Note.objects.bulk_create(
+            [Note(title=str(i), priority=i // 2, created_by=user) for i in range(7)]
+        )
+
+    def walk(self, order_by):
+        titles, cursor, pages = [], None, []
+        while True:
+            data = keyset_paginate_data(
+                queryset=Note.objects.all(),
+                serializer=NoteSerializer,
+                request_data=search(paginator=3, order_by=[order_by], cursor=cursor),
+            )
+            pages.append(data)
+            titles.extend(obj["title"] for obj in data["objects"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                return titles, pages
+
+    def test_walks_forward(self):
+        titles, pages = self.walk("priority")
+
+        self.assertEqual(titles, [str(i) for i in range(7)])
+        self.assertEqual([page["current"] for page in pages], [1, 2, 3])
+        self.assertEqual(pages[0]["previous"], -1)
+        self.assertEqual(pages[-1]["next"], -1)
+
+    def test_walks_descending(self):
+        titles, _ = self.walk("-priority")
+
+        self.assertEqual(
+            [Note.objects.get(title=t).priority for t in titles],
+            [3, 2, 2, 1, 1, 0, 0],
+        )
+
+    def test_walks_backward(self):
+        _, pages = self.walk("priority")
+
+        data = keyset_paginate_data(
+            queryset=Note.objects.all(),
+            serializer=NoteSerializer,
+            request_data=search(
+                paginator=3, order_by=["priority"], cursor=pages[2]["previous_cursor"]
+            ),
+        )
+        self.assertEqual(data["objects"], pages[1]["objects"])
+        self.assertEqual(data["current"], 2)
+
+    def test_fetches_single_page(self):
+        with self.assertNumQueries(1):
+            keyset_paginate_data(
+                queryset=Note.objects.all(),
+                serializer=NoteSerializer,
+                request_data=search(paginator=3, order_by=["priority"]),
+            )
+
+    def test_invalid_cursor_starts_over(self):
+        data = keyset_paginate_data(
+            queryset=Note.objects.all(),
+            serializer=NoteSerializer,
+            request_data=search(paginator=3, order_by=["title"], cursor="garbage"),
+            count="exact",
+        )
+        self.assertEqual(data["current"], 1)
+        self.assertEqual(data["total_objects"], 7)
+        self.assertEqual(data["total_pages"], 3)
+
+    def test_tampered_cursor_starts_over(self):
+        _, pages = self.walk("priority")
+        valid = pages[0]["next_cursor"]
+        unsigned = base64.urlsafe_b64encode(
+            json.dumps({"v": "abc", "pk": 1, "p": "x", "r": False}).encode()
+        ).decode()
+
+        cursors = (
+            unsigned,
+            encode_cursor(value="abc", pk=1, page=2) + "x",
+            encode_cursor(value="abc", pk=1, page="x", order_by="priority"),
+            # Created for another ordering
+            encode_cursor(value="abc", pk=1, page=2, order_by="title"),
+            valid[:-1],
+        )
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                data = keyset_paginate_data(
+                    queryset=Note.objects.all(),
+                    serializer=NoteSerializer,
+                    request_data=search(
+                        paginator=3, order_by=["priority"], cursor=cursor
+                    ),
+                )
+                self.assertEqual(data["current"], 1)
+                self.assertEqual(data["objects"], pages[0]["objects"])
+
+    def test_cursor_value_not_fitting_field_starts_over(self):
+        cursor = encode_cursor(value="abc", pk=1, page=2, order_by="priority")
+
+        data = keyset_paginate_data(
+            queryset=Note.objects.all(),
+            serializer=NoteSerializer,
+            request_data=search(paginator=3, order_by=["priority"], cursor=cursor),
+        )
+        self.assertEqual(data["current"], 1)
+        self.assertEqual(len(data["objects"]), 3)
+
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = ("id", "username")
+
+
+class TestKeysetPaginationNullKeys(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        login = timezone.now()
+        for i in range(5):
+            get_user_model().objects.create(
+                username=str(i), last_login=login if i % 2 else None
+            )
+
+    def walk(self, order_by):
+        usernames, cursor, pages = [], None, []
+        # Bounded, a cursor that restarts at first page never ends
+        for attempt in range(10):
+            data = keyset_paginate_data(
+                queryset=get_user_model().objects.all(),
+                serializer=UserSerializer,
+                request_data=search(paginator=2, order_by=[order_by], cursor=cursor),
+            )
+            pages.append(data)
+            usernames.extend(obj["username"] for obj in data["objects"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        return usernames, pages
+
+    def test_walks_null_keys(self):
+        for order_by, expected in (
+            ("last_login", ["1", "3", "0", "2", "4"]),
+            ("-last_login", ["4", "2", "0", "3", "1"]),
+        ):
+            with self.subTest(order_by=order_by):
+                usernames, pages = self.walk(order_by)
+                self.assertEqual(usernames, expected)
+                self.assertEqual([page["current"] for page in pages], [1, 2, 3])
+
+    def test_walks_backward_from_null_keys(self):
+        _, pages = self.walk("last_login")
+
+        data = keyset_paginate_data(
+            queryset=get_user_model().objects.all(),
+            serializer=UserSerializer,
+            request_data=search(
+                paginator=2,
+                order_by=["last_login"],
+                cursor=pages[2]["previous_cursor"],
+            ),
+        )
+        self.assertEqual(data["objects"], pages[1]["objects"])
+        self.assertEqual(data["current"], 2)
+
+
+class TestQuerySetPagination(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create(username="user")
+        Note.objects.bulk_create(
+            [Note(title=str(i), priority=i, created_by=user) for i in range(7)]
+        )
+
+    def test_slices_in_database(self):
+        with self.assertNumQueries(2):
+            data = queryset_paginate_data(
+                queryset=Note.objects.all(),
+                serializer=NoteSerializer,
+                request_data=search(paginator=3, page=2, order_by=["-priority"]),
+            )
+
+        self.assertEqual([obj["priority"] for obj in data["objects"]], [3, 2, 1])
+        self.assertEqual(data["total_objects"], 7)
+        self.assertEqual(data["total_pages"], 3)
+        self.assertEqual((data["previous"], data["current"], data["next"]), (1, 2, 3))
+
+    def test_ties_ordered_by_pk(self):
+        user = get_user_model().objects.get()
+        ties = Note.objects.filter(title="tie")
+        Note.objects.bulk_create([Note(title="tie", created_by=user) for _ in range(5)])
+
+        for order_by, ordering in (("priority", "pk"), ("-priority", "-pk")):
+            pks = []
+            for page in (1, 2):
+                data = queryset_paginate_data(
+                    queryset=ties,
+                    serializer=NoteSerializer,
+                    request_data=search(paginator=3, page=page, order_by=[order_by]),
+                )
+                pks += [obj["id"] for obj in data["objects"]]
+
+            with self.subTest(order_by=order_by):
+                self.assertEqual(
+                    pks, list(ties.order_by(ordering).values_list("pk", flat=True))
+                )
+
+    def test_out_of_range_page(self):
+        data = queryset_paginate_data(
+            queryset=Note.objects.all(),
+            serializer=NoteSerializer,
+            request_data=search(paginator=3, page=10, order_by=["priority"]),
+            count="estimate",
+        )
+
+        self.assertEqual(data["current"], 3)
+        self.assertEqual(data["next"], -1)
+        self.assertEqual([obj["priority"] for obj in data["objects"]], [6])
+
+    def test_cached_count(self):
+        request_data = search(paginator=3, page=1, order_by=["priority"])
+        queryset_paginate_data(
+            queryset=Note.objects.all(),
+            serializer=NoteSerializer,
+            request_data=request_data,
+            count="cached",
+        )
+
+        with self.assertNumQueries(1):
+            data = queryset_paginate_data(
+                queryset=Note.objects.all(),
+                serializer=NoteSerializer,
+                request_data=request_data,
+                count="cached",
+            )
+        self.assertEqual(data["total_objects"], 7)
+
+
+class TestJsonResponse(TestCase):
+    def test_encodes_with_every_backend(self):
+        value = uuid.uuid4()
+        content = {
+            "at": datetime(2020, 1, 2, 3, 4, 5, 6),
+            "on": date(2020, 1, 2),
+            "uuid": value,
+            "amount": Decimal("1.10"),
+            "label": _("Label"),
+        }
+
+        for backend, (module, _dumps) in JSON_BACKENDS.items():
+            if module is None:
+                continue
+            with self.subTest(backend=backend), override_settings(
+                DRFADDONS_JSON_BACKEND=backend
+            ):
+                response = JsonResponse(content, status=200)
+
+                self.assertEqual(
+                    json.loads(response.content),
+                    {
+                        "data": {
+                            "at": "2020-01-02T03:04:05.000006",
+                            "on": "2020-01-02",
+                            "uuid": str(value),
+                            "amount": "1.10",
+                            "label": "Label",
+                        },
+                        "status_code": 200,
+                    },
+                )
+
+    def test_big_integers(self):
+        for backend, (module, _dumps) in JSON_BACKENDS.items():
+            if module is None:
+                continue
+            with self.subTest(backend=backend), override_settings(
+                DRFADDONS_JSON_BACKEND=backend
+            ):
+                response = JsonResponse({"big": 2**70}, status=200)
+
+                self.assertEqual(json.loads(response.content)["data"]["big"], 2**70)
+
+    @override_settings(DRFADDONS_JSON_BACKEND="yaml")
+    def test_invalid_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            JsonResponse({}, status=200)
+
+
+class TestStreamingJsonResponse(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create(username="user")
+        Note.objects.bulk_create(
+            [Note(title=str(i), priority=i, created_by=user) for i in range(7)]
+        )
+
+    def test_matches_json_response(self):
+        queryset = Note.objects.order_by("priority")
+        expected = JsonResponse(
+            paginate_data(
+                searched_data=NoteSerializer(queryset, many=True),
+                request_data=search(paginator=0, order_by=["priority"]),
+            ),
+            status=202,
+        )
+
+        with self.assertNumQueries(1):
+            response = StreamingJsonResponse(
+                queryset=queryset, serializer=NoteSerializer, status=202, chunk_size=3
+            )
+            content = b"".join(response.streaming_content)
+
+        self.assertEqual(json.loads(content), json.loads(expected.content))
+
+    def test_empty_queryset(self):
+        response = StreamingJsonResponse(
+            queryset=Note.objects.none(), serializer=NoteSerializer, status=202
+        )
+
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["data"]["objects"], [])
+        self.assertEqual(data["data"]["total_objects"], 0)
+
+
+class TestGroupQuerySetByFields(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [get_user_model().objects.create(username=n) for n in "ab"]
+        Note.objects.bulk_create(
+            [
+                Note(title=str(i), priority=i % 3, created_by=users[i % 2])
+                for i in range(6)
+            ]
+        )
+
+    def test_matches_groupby_queryset_with_fields(self):
+        fields = ["priority", "created_by__username"]
+        expected = groupby_queryset_with_fields(Note.objects.all(), fields)
+
+        with self.assertNumQueries(1):
+            groups = group_queryset_by_fields(Note.objects.all(), fields)
+
+        for field in fields:
+            self.assertEqual(
+                [sorted(o.pk for o in group["items"]) for group in groups[field]],
+                [sorted(o.pk for o in group["items"]) for group in expected[field]],
+            )
+        self.assertEqual(
+            [group["key"] for group in groups["created_by__username"]], ["a", "b"]
+        )
+
+    def test_counts_only(self):
+        with self.assertNumQueries(2):
+            groups = group_queryset_by_fields(
+                Note.objects.all(), ["priority", "created_by__username"], items=False
+            )
+
+        self.assertEqual(
+            groups["priority"],
+            [
+                {"key": 0, "count": 2},
+                {"key": 1, "count": 2},
+                {"key": 2, "count": 2},
+            ],
+        )
+        self.assertEqual(
+            groups["created_by__username"],
+            [{"key": "a", "count": 3}, {"key": "b", "count": 3}],
+        )
+
+    def test_iter_queryset_groups(self):
+        fields = ["priority", "created_by__username"]
+        expected = group_queryset_by_fields(Note.objects.all(), fields)
+
+        with self.assertNumQueries(2):
+            groups = [
+                (field, key, [obj.pk for obj in items])
+                for field, key, items in iter_queryset_groups(
+                    Note.objects.all(), fields, chunk_size=2
+                )
+            ]
+
+        self.assertEqual(
+            groups,
+            [
+                (field, group["key"], sorted(obj.pk for obj in group["items"]))
+                for field in fields
+                for group in expected[field]
+            ],
+        )
+
+
+class TestClientIP(TestCase):
+    def request(self, remote_addr, x_forwarded_for=None):
+        headers = {"REMOTE_ADDR": remote_addr}
+        if x_forwarded_for is not None:
+            headers["HTTP_X_FORWARDED_FOR"] = x_forwarded_for
+        return RequestFactory().get("/", **headers)
+
+    def test_trusted_networks(self):
+        networks = TrustedNetworks(["10.0.0.0/8", "192.168.1.7", "2001:db8::/32"])
+
+        for ip, trusted in (
+            ("10.1.2.3", True),
+            ("11.1.2.3", False),
+            ("192.168.1.7", True),
+            ("192.168.1.8", False),
+            ("2001:db8::1", True),
+            ("2001:db9::1", False),
+        ):
+            with self.subTest(ip=ip):
+                self.assertIs(ipaddress.ip_address(ip) in networks, trusted)
+        self.assertFalse(TrustedNetworks([]))
+
+    def test_parse_ip(self):
+        self.assertEqual(parse_ip(" 1.2.3.4:80"), ipaddress.ip_address("1.2.3.4"))
+        self.assertEqual(parse_ip("[::1]:80"), ipaddress.ip_address("::1"))
+        self.assertEqual(parse_ip("::ffff:1.2.3.4"), ipaddress.ip_address("1.2.3.4"))
+        self.assertIsNone(parse_ip("unknown"))
+
+    @override_settings(DRFADDONS_TRUSTED_PROXIES=["10.0.0.0/8"])
+    def test_resolve_client_ip(self):
+        cases = (
+            # Direct client, header is spoofed
+            (("8.8.8.8", "1.1.1.1"), "8.8.8.8"),
+            # Through trusted proxies, first untrusted hop from right
+            (("10.0.0.1", "1.1.1.1, 9.9.9.9, 10.0.0.2"), "9.9.9.9"),
+            (("10.0.0.1", None), "10.0.0.1"),
+            (("10.0.0.1", "10.0.0.3, 10.0.0.2"), "10.0.0.3"),
+            (("10.0.0.1", "1.1.1.1, garbage"), "10.0.0.1"),
+        )
+        for args, ip in cases:
+            with self.subTest(args=args):
+                request = self.request(*args)
+                self.assertEqual(resolve_client_ip(request), ipaddress.ip_address(ip))
+                self.assertEqual(get_client_ip(request), ip)
+
+    def test_result_is_cached_on_request(self):
+        request = self.request("10.0.0.1", "9.9.9.9")
+        with override_settings(DRFADDONS_TRUSTED_PROXIES=["10.0.0.0/8"]):
+            self.assertEqual(str(resolve_client_ip(request)), "9.9.9.9")
+
+        request.META["HTTP_X_FORWARDED_FOR"] = "8.8.8.8"
+        self.assertEqual(str(resolve_client_ip(request)), "9.9.9.9")
+
+    def test_legacy_get_client_ip(self):
+        request = self.request("8.8.8.8", "1.1.1.1, 9.9.9.9")
+        self.assertEqual(get_client_ip(request), "1.1.1.1")
+        self.assertEqual(resolve_client_ip(request), ipaddress.ip_address("8.8.8.8"))
@@ -0,0 +1,54 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from drfaddons.views import PaginatedSearchView
+from tests.helpers import NoteSerializer
+from tests.helpers import SearchSerializer
+from tests.models import Note
+
+
+class NoteSearchView(PaginatedSearchView):
+    serializer_class = SearchSerializer
+    show_serializer = NoteSerializer
+
+    def fetch_data(self, serialized_data):
+        return Note.objects.filter(created_by=self.request.user)
+
+
+class TestPaginatedSearchView(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="user")
+        Note.objects.bulk_create(
+            [Note(title=str(i), priority=i, created_by=cls.user) for i in range(5)]
+        )
+
+    def post(self, view, **data):
+        request = APIRequestFactory().post("/", data, format="json")
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def test_streams_unpaginated_results(self):
+        view = NoteSearchView.as_view(stream_chunk_size=2)
+
+        response = self.post(view, paginator=0, order_by=["-priority"])
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["status_code"], 202)
+        self.assertEqual(
+            [obj["priority"] for obj in data["data"]["objects"]], [4, 3, 2, 1, 0]
+        )
+
+    def test_paginated_results_are_not_streamed(self):
+        view = NoteSearchView.as_view(stream_chunk_size=2)
+
+        response = self.post(view, paginator=2, order_by=["priority"])
+
+        data = json.loads(response.content)
+        self.assertEqual(data["data"]["total_pages"], 3)